@@ -37,5 +37,6 @@ setup(
         "Intended Audience :: Science/Research",
     ],
     install_requires=["numpy!=1.19.4", "matplotlib", "unyt"],
+    extras_require={"pandas": ["pandas"], "arrow": ["pyarrow"]},
     entry_points={"console_scripts": ["pip_upgrade_all=toolbag.pip_upgrade_all:main"]},
 )
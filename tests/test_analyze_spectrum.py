@@ -0,0 +1,51 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+from toolbag import analyze_spectrum
+
+
+def test_analyze_spectrum():
+    fs = 1e6  # S/s
+    n_samples = 2**14
+    t = np.arange(n_samples) / fs
+    f = 101234.5  # Hz
+    rng = np.random.default_rng(0)
+    y = (
+        np.sin(2 * np.pi * f * t)
+        + 1e-3 * np.sin(2 * np.pi * 2 * f * t + 0.3)
+        + 10**-3.5 * np.sin(2 * np.pi * 3 * f * t)
+        + 1e-4 * np.sin(2 * np.pi * 333333 * t)
+        + 1e-4 * rng.standard_normal((2, 3, n_samples))
+    )
+    metrics = analyze_spectrum(y, fs, n_harmonics=6, n_spurs=2)
+    assert metrics.frequency.shape == (2, 3)
+    assert metrics.harmonic_amplitude.shape == (2, 3, 6)
+    assert np.allclose(metrics.frequency, f, atol=1)
+    assert np.allclose(metrics.amplitude, 1, rtol=1e-3)
+    # 5th harmonic aliases to fs - 5 * f
+    assert np.allclose(metrics.harmonic_frequency[..., 3], fs - 5 * f, atol=5)
+    assert np.allclose(metrics.harmonic_amplitude[..., :2], [1e-3, 10**-3.5], rtol=2e-2)
+    assert np.allclose(metrics.spur_frequency[..., 0], 333333, atol=fs / n_samples)
+    assert np.allclose(metrics.spur_amplitude[..., 0], 1e-4, rtol=0.2)
+    # the spur counts as noise
+    noise = 1e-8 + 0.5e-8
+    distortion = 0.5 * (1e-6 + 1e-7)
+    assert np.allclose(metrics.snr, 10 * np.log10(0.5 / noise), atol=0.5)
+    assert np.allclose(metrics.thd, 10 * np.log10(distortion / 0.5), atol=0.1)
+    assert np.allclose(metrics.sfdr, 60, atol=0.1)
+    sinad = 10 * np.log10(0.5 / (noise + distortion))
+    assert np.allclose(metrics.sinad, sinad, atol=0.1)
+    assert np.allclose(metrics.enob, (sinad - 1.76) / 6.02, atol=0.02)
+
+
+def test_analyze_spectrum_coinciding_harmonics():
+    # with the tone at about fs / 5, the 2nd and 3rd harmonic alias to 2 fs / 5
+    fs = 1.0
+    n_samples = 2**14
+    t = np.arange(n_samples) / fs
+    f = 3277 / n_samples
+    y = np.sin(2 * np.pi * f * t) + 1e-3 * np.sin(2 * np.pi * 2 * f * t)
+    metrics = analyze_spectrum(y, fs, n_harmonics=4)
+    assert np.isclose(metrics.harmonic_amplitude[0], 1e-3, rtol=2e-2)
+    assert metrics.harmonic_amplitude[1] < 1e-5
+    assert np.isclose(metrics.thd, -60, atol=0.1)
@@ -0,0 +1,63 @@
+"""Test the parse cache"""
+import os
+import pathlib
+import shutil
+import numpy as np
+import pytest
+from unyt import unyt_array
+from unyt.testing import allclose_units
+from toolbag import read_csv, read_ltraw, enable_cache, disable_cache, clear_cache
+
+data_dir = pathlib.Path("tests/data files")
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def cache(tmp_path):
+    yield enable_cache(tmp_path.joinpath("cache"), max_size=2 ** 20)
+    disable_cache()
+
+
+def test_read_csv(cache, tmp_path):
+    file = tmp_path.joinpath("data.csv")
+    shutil.copy(data_dir.joinpath("column header data labels.csv"), file)
+    data = read_csv(file)
+    assert len(list(cache.directory.glob("*.npy"))) == 1
+    cached = read_csv(file)
+    assert isinstance(cached._data, np.memmap)  # pylint: disable=protected-access
+    assert allclose_units(cached.Voltage, data.Voltage)
+    assert cached.header == data.header
+    assert read_csv.header == data.header
+    with open(file, "at") as f:
+        f.write("10,100\n")
+    assert allclose_units(read_csv(file).Time, unyt_array(np.arange(11), "s"))
+    clear_cache(file)
+    assert len(list(cache.directory.glob("*"))) == 0
+
+
+def test_unchanged_content(cache, tmp_path):
+    file = tmp_path.joinpath("data.csv")
+    shutil.copy(data_dir.joinpath("single row header.csv"), file)
+    read_csv(file)
+    os.utime(file, ns=(0, 0))
+    assert np.all(read_csv(file) == np.arange(10))
+    assert read_csv.header == "My data"
+    assert isinstance(read_csv(file), np.memmap)
+
+
+def test_read_ltraw(cache):
+    file = data_dir.joinpath("vsource ac.raw")
+    sim = read_ltraw(file)
+    cached = read_ltraw(file)
+    assert cached.variables == sim.variables
+    assert cached.header["plotname"] == sim.header["plotname"]
+    assert allclose_units(cached["I(C1)"].imag, unyt_array([1, 2, 3], "A"))
+
+
+def test_eviction(tmp_path):
+    cache = enable_cache(tmp_path.joinpath("cache"), max_size=1)
+    try:
+        read_csv(data_dir.joinpath("2d array.csv"))
+    finally:
+        disable_cache()
+    assert len(list(cache.directory.glob("*"))) == 0
@@ -1,7 +1,8 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 import numpy as np
-from toolbag import extract_singletone
+import pytest
+from toolbag import extract_singletone, extract_singletones, track_singletone
 
 
 def test_extract_singletone():
@@ -21,3 +22,74 @@ def test_extract_singletone():
     result = extract_singletone(y, fs, approx_freq=125e6)
     expected = (125000000.00062592, 1.0000002210999446)
     assert np.allclose(result, expected)
+
+
+def test_extract_singletones():
+    fs = 5000  # S/s
+    f = np.array([[1000.1], [2000.001], [312.5]])  # Hz
+    amp = np.array([[0.5], [1.101], [2.0]])
+    t = np.arange(0, 2, 1 / fs)
+    y = amp * np.sin(2 * np.pi * f * t)
+    f_est, amp_est = extract_singletones(y, fs)
+    assert f_est.shape == (3,)
+    for i, record in enumerate(y):
+        assert np.allclose((f_est[i], amp_est[i]), extract_singletone(record, fs))
+    assert np.allclose(f_est, f[:, 0])
+    assert np.allclose(amp_est, amp[:, 0], rtol=1e-2)
+    f_est, amp_est = extract_singletones(y, fs, approx_freq=2000, search=0.01)
+    assert np.allclose(f_est[1], 2000.001)
+    z = amp * np.exp(2j * np.pi * f * t)
+    f_est, amp_est = extract_singletones(z, fs)
+    assert np.allclose(f_est, f[:, 0])
+
+
+def test_extract_singletone_zoom():
+    fs = 1e6  # S/s
+    n_samples = 2**16
+    t = np.arange(n_samples) / fs
+    y = 0.5 * np.sin(2 * np.pi * 123456.7 * t) + 0.25 * np.sin(2 * np.pi * 2e3 * t)
+    # the search range spans only the bins 8088 and 8089
+    zoom = extract_singletone(y, fs, approx_freq=123456.7, search=1e-5)
+    full = extract_singletone(y, fs, approx_freq=123456.7, search=0.05)
+    assert np.allclose(zoom, full, rtol=1e-9)
+    assert np.isclose(zoom[0], 123456.7, rtol=1e-6)
+    assert np.isclose(zoom[1], 0.5, rtol=1e-2)
+    # records not a multiple of the block length and complex records
+    t = np.arange(n_samples + 123) / fs
+    y = 0.5 * np.sin(2 * np.pi * 123456.7 * t)
+    y = np.stack([y, 1j * y])
+    zoom = extract_singletones(y, fs, approx_freq=123456.7, search=1e-5)
+    full = extract_singletones(y, fs, approx_freq=123456.7, search=0.05)
+    assert np.allclose(zoom, full, rtol=1e-9)
+
+
+def test_track_singletone():
+    fs = 10000  # S/s
+    t = np.arange(50000) / fs
+    f = 1000 + 20 * t  # Hz
+    y = 0.5 * np.sin(2 * np.pi * np.cumsum(f) / fs)
+    chunks = np.split(y, [1, 700, 9000, 9001, 33333])
+    track = list(track_singletone(chunks, fs, 2048, hop=512, batch=8))
+    time = np.concatenate([t for t, _, _ in track])
+    freq = np.concatenate([f for _, f, _ in track])
+    amp = np.concatenate([a for _, _, a in track])
+    assert len(time) == (len(y) - 2048) // 512 + 1
+    starts = np.arange(len(time)) * 512
+    assert np.allclose(time, (starts + 2047 / 2) / fs)
+    frames = np.stack([y[i : i + 2048] for i in starts])
+    expected = extract_singletones(frames, fs)
+    assert np.allclose(freq, expected[0])
+    assert np.allclose(amp, expected[1])
+    assert np.allclose(freq, 1000 + 20 * time, atol=0.5)
+
+
+@pytest.mark.parametrize("hop", [1, 100, 255, 256])
+def test_track_singletone_chunking(hop):
+    fs = 10000  # S/s
+    y = np.sin(2 * np.pi * 1000 * np.arange(5000) / fs)
+    whole = [np.concatenate(a) for a in zip(*track_singletone([y], fs, 256, hop))]
+    for sizes in [[1, 2, 300, 256, 3000], [255, 1, 1, 1, 700, 257]]:
+        chunks = np.split(y, np.cumsum(sizes))
+        track = list(track_singletone(chunks, fs, 256, hop, batch=7))
+        for expected, actual in zip(whole, zip(*track)):
+            assert np.allclose(np.concatenate(actual), expected)
@@ -1,5 +1,6 @@
 """Test LabVIEW utilities"""
 import numpy as np
+import pytest
 from toolbag.labview_utilities import threshold_1d, interpolate_1d
 
 # pylint: disable=missing-function-docstring
@@ -61,3 +62,31 @@ def test_interpolate1d():
     x = 2
     expected_y = 7
     assert interpolate_1d(array, x) == expected_y
+
+
+def test_threshold1d_array():
+    array = [2.3, 5.2, 7.8, 7.9, 9.0, 9.1, 10.3, 12.9, 15.5]
+    thresholds = np.array([0, 2.3, 6.5, 9.1, 14.2, 16])
+    x = threshold_1d(array, thresholds)
+    assert x.shape == thresholds.shape
+    expected = [threshold_1d(array, threshold) for threshold in thresholds]
+    assert np.allclose(x, expected)
+    assert np.allclose(x, [0, 0, 1.5, 5, 7.5, 8])
+    assert np.allclose(threshold_1d(array, [0, 14.2], start_index=5), [5, 7.5])
+    rows = np.array([[0, 1, 2, 3, 2, 1, 0], [0, 2, 4, 6, 8, 10, 12]])
+    assert np.allclose(threshold_1d(rows, 1.5), [1.5, 0.75])
+    assert np.allclose(threshold_1d(rows, [1.5, 5]), [1.5, 2.5])
+    assert np.allclose(threshold_1d(rows, [[1, 3], [1, 3]]), [[1, 3], [0.5, 1.5]])
+    assert np.allclose(threshold_1d(rows, [[1, 3]]), [[1, 3], [0.5, 1.5]])
+    with pytest.raises(ValueError):
+        threshold_1d(rows, [1.5, 5, 7])
+
+
+def test_interpolate1d_array():
+    array = [5, 7, 11]
+    y = interpolate_1d(array, [-1, 0, 0.5, 1.25, 2, 3])
+    assert np.allclose(y, [5, 5, 6, 8, 11, 11])
+    rows = np.array([[5, 7, 11], [0, 10, 20]])
+    assert np.allclose(interpolate_1d(rows, 0.5), [6, 5])
+    assert np.allclose(interpolate_1d(rows, [0.5, 1.5]), [6, 15])
+    assert np.allclose(interpolate_1d(rows, [[0.5, 2], [1.5, -1]]), [[6, 11], [15, 0]])
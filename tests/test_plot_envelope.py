@@ -0,0 +1,38 @@
+"""Test plot_envelope"""
+import numpy as np
+import matplotlib.pyplot as plt
+from unyt import unyt_array
+from toolbag import plot_envelope
+
+# pylint: disable=missing-function-docstring
+def test_plot_envelope():
+    x = np.linspace(0, 1, 1_000_001)
+    y = np.sin(2 * np.pi * 50 * x)
+    y[500_000] = 3
+    _, ax = plt.subplots()
+    line = plot_envelope(ax, x, y, pixels=100)
+    assert len(line.get_xdata()) <= 4 * 4 * 100
+    assert line.get_ydata().max() == 3
+    assert line.get_ydata().min() == y.min()
+    ax.set_xlim(0.25, 0.75)
+    xdata = line.get_xdata()
+    assert len(xdata) <= 4 * 4 * 100 + 2
+    assert xdata.min() < 0.25 < 0.75 < xdata.max() < 0.76
+    assert line.get_ydata().max() == 3
+    # full resolution once the window is small enough
+    ax.set_xlim(0.5, 0.5001)
+    assert np.all(line.get_xdata() == x[499_999:500_102])
+    plt.close()
+
+
+def test_plot_envelope_units():
+    x = unyt_array(np.linspace(0, 1e-3, 100_000), "s")
+    y = unyt_array(np.cos(2 * np.pi * 1e4 * x.v), "V")
+    _, ax = plt.subplots()
+    line = plot_envelope(ax, x, y, pixels=100)
+    assert line.get_xdata(orig=True).units == x.units
+    assert line.get_ydata(orig=True).units == y.units
+    ax.set_xlim(0.2e-3, 0.3e-3)
+    assert line.get_xdata(orig=True).units == x.units
+    assert np.all(np.asarray(line.get_xdata()) <= 0.31e-3)
+    plt.close()
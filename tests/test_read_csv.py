@@ -1,5 +1,7 @@
 """Test read_csv"""
 from io import StringIO
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pathlib
 import pytest
 import numpy as np
@@ -89,6 +91,16 @@ def test_column_header_datalabels():
     )
 
 
+def test_contiguous_columns():
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    assert data.Time.flags.c_contiguous and data.Voltage.flags.c_contiguous
+    # pylint: disable=protected-access
+    assert np.shares_memory(data.Voltage, data._data)
+    file = data_dir.joinpath("column header data labels.csv")
+    for chunk in read_csv.iter_chunks(file, rows=4):
+        assert chunk.Voltage.flags.c_contiguous
+
+
 def test_prefixes():
     data = read_csv(data_dir.joinpath("column header data labels units prefixes.csv"))
     expected_array = unyt_array([0.0, 1.0e-6, 3.0e6], "s")
@@ -172,3 +184,153 @@ def test_rowheaderragged():
 def test_singlerowdatalabel():
     data = read_csv(data_dir.joinpath("single row data label.csv"))
     assert np.all(data.Time == unyt_array(list(range(10)), "s"))
+
+
+def test_bulk_prefixes():
+    file = StringIO("My data\n1.0p,3u,NaN,-Inf,,4m,5M,-2.5n,1.5E-3")
+    data = read_csv(file)
+    file.close()
+    expected = [1e-12, 3e-6, np.nan, -np.inf, np.nan, 4e-3, 5e6, -2.5e-9, 1.5e-3]
+    assert np.allclose(data, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "cell", ["1_0", "1e5", ".5", "nan", "infinity", "1e-06y", "1.5E+3k"]
+)
+def test_bulk_grammar(cell):
+    # the bulk path accepts the same cells as parsing one cell at a time
+    data = read_csv(StringIO(f"{cell},2"))
+    assert cell in data
+    assert np.all(data[0].value == [2])
+
+
+def test_non_numeric():
+    file = StringIO("Time (s),1,2\nVoltage (V),3,abc")
+    with pytest.raises(Exception, match="Non numeric value 'abc'"):
+        read_csv(file)
+    file.close()
+
+
+def test_iter_chunks_column():
+    file = data_dir.joinpath("column header data labels.csv")
+    chunks = list(read_csv.iter_chunks(file, rows=4))
+    assert [len(chunk.Time) for chunk in chunks] == [4, 4, 2]
+    assert read_csv.header == (
+        "Some data generated in LabVIEW\nPartioned into columns of Time, Voltage"
+    )
+    assert chunks[0].header == read_csv.header
+    time = np.concatenate([chunk.Time for chunk in chunks])
+    assert allclose_units(time, unyt_array(np.arange(10), "s"))
+    voltage = np.concatenate([chunk.Voltage for chunk in chunks])
+    assert allclose_units(voltage, unyt_array(np.arange(10) ** 2, "V"))
+
+
+def test_iter_chunks_row():
+    file = data_dir.joinpath("row header data labels.csv")
+    chunks = list(read_csv.iter_chunks(file, rows=1))
+    assert len(chunks) == 2
+    assert allclose_units(chunks[0].R0, unyt_array([0, 1, 2], "s"))
+    assert allclose_units(chunks[1].R1, unyt_array([3, 4, 5], "V/m"))
+
+
+def test_iter_chunks_array():
+    chunks = list(read_csv.iter_chunks(data_dir.joinpath("single column.csv"), 3))
+    assert [chunk.shape for chunk in chunks] == [(3,), (3,), (3,), (1,)]
+    assert np.all(np.concatenate(chunks) == np.arange(10))
+    file = StringIO("My data\n0,0\n1,1\n2,4")
+    chunks = list(read_csv.iter_chunks(file, rows=2))
+    file.close()
+    assert np.all(np.concatenate(chunks) == [[0, 0], [1, 1], [2, 4]])
+    assert read_csv.header == "My data"
+    # the last chunk of a 2D array keeps its rows
+    file = StringIO("0,0\n1,1\n2,4")
+    chunks = list(read_csv.iter_chunks(file, rows=2))
+    assert [chunk.shape for chunk in chunks] == [(2, 2), (1, 2)]
+
+
+@pytest.mark.parametrize("name", ["single row.csv", "single row header.csv"])
+def test_iter_chunks_single_row(name):
+    (chunk,) = read_csv.iter_chunks(data_dir.joinpath(name))
+    assert chunk.shape == read_csv(data_dir.joinpath(name)).shape == (10,)
+
+
+def test_concurrent():
+    files = [
+        "column header data labels.csv",
+        "row header data labels.csv",
+        "single row header.csv",
+    ] * 20
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(read_csv, [data_dir.joinpath(f) for f in files]))
+    for file, data in zip(files, results):
+        if file.startswith("column"):
+            assert allclose_units(data.Voltage, unyt_array(np.arange(10) ** 2, "V"))
+        elif file.startswith("row"):
+            assert allclose_units(data.R1, unyt_array([3, 4, 5], "V/m"))
+        else:
+            assert np.all(data == np.arange(10))
+
+
+def test_timestamp_array():
+    # hourly across 2020 to include the transitions of any local time zone
+    start = (datetime(2020, 1, 1) - datetime(1904, 1, 1)).total_seconds()
+    ts = start + np.arange(0, 366 * 86400, 3599.25)
+    result = convert_timestamp(ts)
+    assert result.dtype == "datetime64[ns]"
+    expected = [np.datetime64(convert_timestamp(v), "ns") for v in ts]
+    assert np.all(result == expected)
+    result = convert_timestamp(np.array([ts[0], np.nan]), utc=True)
+    assert result[0] == np.datetime64("2020-01-01T00:00:00", "ns")
+    assert np.isnat(result[1])
+
+
+def test_item_cache():
+    data = read_csv(StringIO("Time (s),Voltage (V),Current (A)\n0,1,2\n3,4,5"))
+    assert data["Time"] is data[0]
+    assert data["Time (s)"] is data.Time
+    assert data[-1] is data.Current
+    assert "Voltage" in data and "Voltage (V)" in data and "Power" not in data
+    assert [x.name for x in data[1:]] == ["Voltage", "Current"]
+    with pytest.raises(KeyError):
+        data["Power"]  # pylint: disable=pointless-statement
+    with pytest.raises(IndexError):
+        data[3]  # pylint: disable=pointless-statement
+    data = read_csv(StringIO("Time (s),Voltage (V),Current (A)\n0,1,2\n3,4,5"))
+    data.cache_budget = 2 * data.Time.nbytes
+    time = data.Time
+    voltage = data.Voltage
+    data.Current  # pylint: disable=pointless-statement
+    # Time was the least recently used column
+    assert data.Voltage is voltage
+    assert data.Time is not time
+
+
+def test_to_dict_of_arrays():
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    arrays = data.to_dict_of_arrays()
+    assert list(arrays) == ["Time (s)", "Voltage (V)"]
+    assert np.all(arrays["Voltage (V)"] == np.arange(10) ** 2)
+    assert np.shares_memory(arrays["Voltage (V)"], data.Voltage)
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    df = data.to_pandas()
+    assert np.all(df["Voltage (V)"].to_numpy() == np.arange(10) ** 2)
+    assert np.shares_memory(df["Voltage (V)"].to_numpy(), data.Voltage)
+    assert df.attrs["units"] == {"Time (s)": "s", "Voltage (V)": "V"}
+    assert df.attrs["names"] == {"Time (s)": "Time", "Voltage (V)": "Voltage"}
+    assert df.attrs["header"] == data.header
+
+
+def test_to_arrow():
+    pytest.importorskip("pyarrow")
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    table = data.to_arrow()
+    assert table.column_names == ["Time (s)", "Voltage (V)"]
+    voltage = table.column("Voltage (V)").to_numpy()
+    assert np.shares_memory(voltage, data.Voltage)
+    metadata = table.schema.field("Voltage (V)").metadata
+    assert metadata == {b"unit": b"V", b"name": b"Voltage"}
+    assert table.schema.metadata[b"header"] == data.header.encode()
@@ -1,11 +1,53 @@
 """Test read_ltraw"""
 import pathlib
+import numpy as np
+import pytest
 from unyt import unyt_array
 from unyt.testing import allclose_units
 from toolbag import read_ltraw
 
 data_dir = pathlib.Path("tests/data files")
 
+
+def make_raw(path, time, traces, flags="real forward", fmt="binary", encoding=None):
+    """Write a transient raw file with voltage traces V(n1), V(n2), ..."""
+    flags = flags.split()
+    encoding = "utf-16-le" if encoding is None else encoding
+    n_variables = len(traces) + 1
+    variables = "".join(f"\t{i}\tV(n{i})\tvoltage\n" for i in range(1, n_variables))
+    header = (
+        "Title: * D:\\temp\\ltspice\\test.asc\n"
+        "Date: Wed Jul 29 07:20:47 2020\n"
+        "Plotname: Transient Analysis\n"
+        f"Flags: {' '.join(flags)}\n"
+        f"No. Variables: {n_variables}\n"
+        f"No. Points: {len(time)}\n"
+        "Offset:   0.0000000000000000e+000\n"
+        "Command: Linear Technology Corporation LTspice XVII\n"
+        "Variables:\n"
+        f"\t0\ttime\ttime\n{variables}"
+    )
+    var_fmt = "<f8" if "double" in flags else "<f4"
+    with open(path, "wb") as f:
+        if fmt == "ascii":
+            f.write((header + "Values:\n").encode(encoding))
+            for i, values in enumerate(zip(time, *traces)):
+                lines = "".join(f"\t{v:.15e}\n" for v in values)
+                f.write(f"{i}{lines}".encode(encoding))
+        elif "fastaccess" in flags:
+            f.write((header + "Binary:\n").encode(encoding))
+            f.write(np.asarray(time, "<f8").tobytes())
+            for trace in traces:
+                f.write(np.asarray(trace, var_fmt).tobytes())
+        else:
+            f.write((header + "Binary:\n").encode(encoding))
+            point = np.dtype([("x", "<f8"), ("y", var_fmt, (len(traces),))])
+            values = np.empty(len(time), point)
+            values["x"] = time
+            values["y"] = np.transpose(traces)
+            f.write(values.tobytes())
+
+
 # pylint: disable=missing-function-docstring
 def test_vsource():
     sim = read_ltraw(data_dir.joinpath("vsource.raw"))
@@ -31,3 +73,126 @@ def test_vsourceac():
     assert allclose_units(sim.frequency, unyt_array([1, 2, 3], "Hz"))
     assert allclose_units(sim["V(v1)"], unyt_array(3 * [complex(1, 0)], "V"))
     assert allclose_units(sim["I(C1)"].imag, unyt_array([1, 2, 3], "A"))
+    assert sim.frequency.flags.c_contiguous
+
+
+def test_double(tmp_path):
+    time = np.linspace(0, 1e-3, 11)
+    traces = [np.sin(time), 1 / 3 + time]
+    time[5] *= -1
+    make_raw(tmp_path.joinpath("double.raw"), time, traces, "real forward double")
+    sim = read_ltraw(tmp_path.joinpath("double.raw"))
+    assert allclose_units(sim.time, unyt_array(np.abs(time), "s"))
+    assert np.all(sim["V(n2)"].value == traces[1])
+
+
+def test_lazy():
+    sim = read_ltraw(data_dir.joinpath("vsource.raw"), lazy=True)
+    assert len(sim) == 7
+    assert allclose_units(sim.time[-1], unyt_array(0.001, "s"))
+    assert allclose_units(sim["I(R2)"], unyt_array(4 * [4.0], "A"))
+    with open(data_dir.joinpath("vsource ac.raw"), "rb") as f:
+        sim = read_ltraw(f, lazy=True)
+    assert allclose_units(sim.frequency, unyt_array([1, 2, 3], "Hz"))
+    assert allclose_units(sim["I(C1)"].imag, unyt_array([1, 2, 3], "A"))
+
+
+def test_lazy_array_copy():
+    sim = read_ltraw(data_dir.joinpath("vsource.raw"), lazy=True)
+    # pylint: disable=protected-access
+    data = np.array(sim._data, dtype=np.float32)
+    assert data.dtype == np.float32
+    assert data.shape == (len(sim), 4)
+    with pytest.raises(ValueError):
+        np.array(sim._data, copy=False)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_stepped(tmp_path, lazy):
+    time = np.tile(np.linspace(0, 1e-3, 5), 3)
+    traces = [np.repeat([1.0, 2.0, 3.0], 5)]
+    file = tmp_path.joinpath("stepped.raw")
+    make_raw(file, time, traces, "real forward stepped")
+    file.with_suffix(".log").write_text(
+        "Circuit: * stepped.asc\n\n.step r=1k c=10n\n.step r=2.2k c=10n\n"
+        ".step r=1meg c=10n\n\nDate: Wed Jul 29 07:20:47 2020\n",
+        encoding="utf-16-le",
+    )
+    sim = read_ltraw(file, lazy=lazy)
+    assert len(sim.runs) == 3
+    assert np.all(sim.runs.offsets == [0, 5, 10, 15])
+    assert sim.runs.parameters[1] == {"r": 2200.0, "c": 1e-8}
+    assert sim.runs.parameters[2]["r"] == 1e6
+    run = sim.runs[1]
+    assert allclose_units(run["V(n1)"], unyt_array(5 * [2.0], "V"))
+    assert allclose_units(run.time, unyt_array(np.linspace(0, 1e-3, 5), "s"))
+    assert allclose_units(sim.runs[-1]["V(n1)"], unyt_array(5 * [3.0], "V"))
+    stacked = sim.runs.stack("V(n1)")
+    assert stacked.shape == (3, 5)
+    assert np.shares_memory(stacked, sim["V(n1)"])
+    assert np.all(stacked[:, 0].value == [1, 2, 3])
+    # pylint: disable=protected-access
+    data = np.array(run._data, copy=True)
+    assert data.shape == (2, 5)
+    assert not np.shares_memory(data, sim["V(n1)"])
+    if lazy:
+        with pytest.raises(ValueError):
+            np.array(run._data, copy=False)
+    else:
+        assert np.shares_memory(np.asarray(run._data), sim["V(n1)"])
+
+
+def test_not_stepped():
+    sim = read_ltraw(data_dir.joinpath("vsource.raw"))
+    assert len(sim.runs) == 1
+    assert sim.runs.parameters is None
+    assert allclose_units(sim.runs[0]["V(v2)"], unyt_array(4 * [3.0], "V"))
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_fastaccess(tmp_path, lazy):
+    time = np.linspace(0, 1e-3, 11)
+    traces = [np.sin(time), np.cos(time)]
+    make_raw(tmp_path.joinpath("fast.raw"), time, traces, "real forward fastaccess")
+    sim = read_ltraw(tmp_path.joinpath("fast.raw"), lazy=lazy)
+    assert allclose_units(sim.time, unyt_array(time, "s"))
+    assert np.allclose(sim["V(n1)"].value, traces[0])
+    assert np.allclose(sim["V(n2)"].value, traces[1])
+    if lazy:
+        assert sim["V(n2)"].dtype == np.float32
+        assert not sim["V(n2)"].flags.owndata
+
+
+@pytest.mark.parametrize("encoding", ["utf-16-le", "latin-1"])
+def test_ascii(tmp_path, encoding):
+    time = np.linspace(0, 1e-3, 11)
+    traces = [np.sin(time), np.cos(time)]
+    file = tmp_path.joinpath("ascii.raw")
+    make_raw(file, time, traces, fmt="ascii", encoding=encoding)
+    sim = read_ltraw(file)
+    assert sim.header["format"] == "ascii"
+    assert allclose_units(sim.time, unyt_array(time, "s"))
+    assert np.allclose(sim["V(n2)"].value, traces[1])
+
+
+def test_ascii_invalid(tmp_path):
+    time = np.linspace(0, 1e-3, 3)
+    file = tmp_path.joinpath("ascii.raw")
+    make_raw(file, time, [np.ones(3)], fmt="ascii", encoding="latin-1")
+    text = file.read_text(encoding="latin-1")
+    file.write_text(text.replace("\n2\t", "\n2\tx"), encoding="latin-1")
+    with pytest.raises(ValueError, match="invalid number"):
+        read_ltraw(file)
+    file.write_text(text.rpartition("\t")[0], encoding="latin-1")
+    with pytest.raises(ValueError, match="fewer values"):
+        read_ltraw(file)
+
+
+def test_to_arrow_complex():
+    pytest.importorskip("pyarrow")
+    sim = read_ltraw(data_dir.joinpath("vsource ac.raw"))
+    table = sim.to_arrow()
+    assert table.column_names == sim.variables
+    current = table.column("I(C1)").combine_chunks().flatten().to_numpy()
+    assert np.allclose(current.reshape((-1, 2))[:, 1], [1, 2, 3])
+    assert table.schema.field("I(C1)").metadata[b"unit"] == b"A"
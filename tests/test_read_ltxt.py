@@ -1,8 +1,10 @@
 """Test read_ltxt"""
 from tempfile import TemporaryFile
+import pytest
 from unyt import unyt_array
 from unyt.testing import allclose_units
 from toolbag import read_ltxt
+from toolbag.ltspice_utilities import Error
 
 
 # pylint: disable=missing-function-docstring
@@ -58,3 +60,45 @@ def test_frequency_reim():
     assert allclose_units(data.V_out[0], expected)
     expected = unyt_array([0.0, 3.0], "V")
     assert allclose_units(data.V_out[1], expected)
+
+
+def test_mixed_columns():
+    with TemporaryFile(mode="w+t", encoding="utf-8") as file:
+        file.write(
+            "Freq.\tV(in)\tV(out)\tI(R1)\n"
+            "1.0e+0\t(1.0e+0dB,2.0e+0°)\t3.0e+0,4.0e+0\t5.0e+0\n"
+            "2.0e+0\t(-1.0e+0dB,-2.0e+0°)\t-3.0e+0,-4.0e+0\t-5.0e+0\n"
+        )
+        file.seek(0)
+        data = read_ltxt(file)
+    assert len(data) == 4
+    assert data.frequency.dtype == "float64"
+    assert allclose_units(data.V_in[0], unyt_array([1.0, -1.0], "dB"))
+    assert allclose_units(data.V_in[1], unyt_array([2.0, -2.0], "degree"))
+    assert allclose_units(data.V_out[0], unyt_array([3.0, -3.0], "V"))
+    assert allclose_units(data.V_out[1], unyt_array([4.0, -4.0], "V"))
+    assert allclose_units(data.I_R1, unyt_array([5.0, -5.0], "A"))
+
+
+def test_cp1252(tmp_path):
+    file = tmp_path.joinpath("cp1252.txt")
+    file.write_bytes("Freq.\tV(out)\n1.0e+0\t(-3.0e+0dB,-9.0e+1°)\n".encode("cp1252"))
+    data = read_ltxt(file)
+    assert allclose_units(data.V_out[0], unyt_array([-3.0], "dB"))
+    assert allclose_units(data.V_out[1], unyt_array([-90.0], "degree"))
+
+
+def test_truncated():
+    with TemporaryFile(mode="w+t", encoding="utf-8") as file:
+        file.write("time\tV(out)\n0.0e+0\t1.0e+0\n1.0e+0\n")
+        file.seek(0)
+        with pytest.raises(Error):
+            read_ltxt(file)
+
+
+def test_invalid_number():
+    with TemporaryFile(mode="w+t", encoding="utf-8") as file:
+        file.write("time\tV(out)\n0.0e+0\t1.0e+0\n1.0e+0\tx\n")
+        file.seek(0)
+        with pytest.raises(Error):
+            read_ltxt(file)
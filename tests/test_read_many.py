@@ -0,0 +1,129 @@
+"""Test read_many"""
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import sys
+import numpy as np
+import pytest
+from unyt import unyt_array
+from unyt.testing import allclose_units
+from toolbag import read_many, read_csv, read_ltraw
+from toolbag.common import DCBase
+from toolbag.labview_utilities import DataContainer
+
+data_dir = pathlib.Path("tests/data files")
+
+# pylint: disable=missing-function-docstring
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_read_many(executor):
+    files = [
+        data_dir.joinpath("column header data labels.csv"),
+        data_dir.joinpath("missing.csv"),
+        data_dir.joinpath("single row.csv"),
+    ]
+    results, errors = read_many(files, workers=2, executor=executor)
+    assert allclose_units(results[0].Voltage, unyt_array(np.arange(10) ** 2, "V"))
+    assert results[1] is None
+    assert isinstance(errors[files[1]], FileNotFoundError)
+    assert np.all(results[2] == np.arange(10))
+    assert len(errors) == 1
+
+
+def test_read_many_ltraw():
+    files = [data_dir.joinpath("vsource.raw"), data_dir.joinpath("vsource ac.raw")]
+    results, errors = read_many(files, reader=read_ltraw, workers=2)
+    assert not errors
+    assert results[1].variables == ["frequency", "V(v1)", "I(C1)", "I(V1)"]
+
+
+def test_pickle():
+    assert pickle.loads(pickle.dumps(read_csv)) is read_csv
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    data = pickle.loads(pickle.dumps(data))
+    assert allclose_units(data.Time, unyt_array(np.arange(10), "s"))
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        read_many([], executor="cluster")
+
+
+def test_shared_memory():
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    handle = data.to_shared_memory()
+    assert len(pickle.dumps(handle)) < 1000
+    other = DataContainer.from_shared_memory(handle)
+    # pylint: disable=protected-access
+    assert np.shares_memory(other.Voltage, other._data)
+    assert allclose_units(other.Voltage, unyt_array(np.arange(10) ** 2, "V"))
+    voltage = data.Voltage
+    other.release()
+    data.release()
+    # arrays keep the memory mapped after the block is released
+    assert allclose_units(voltage, unyt_array(np.arange(10) ** 2, "V"))
+    with pytest.raises(FileNotFoundError):
+        DataContainer.from_shared_memory(handle)
+
+
+def test_read_many_shared_memory():
+    files = [data_dir.joinpath("vsource.raw"), data_dir.joinpath("vsource ac.raw")]
+    results, errors = read_many(files, reader=read_ltraw, shared_memory=True)
+    assert not errors
+    assert results[1].variables == ["frequency", "V(v1)", "I(C1)", "I(V1)"]
+    assert allclose_units(results[1].frequency, unyt_array([1, 2, 3], "Hz"))
+    for result in results:
+        result.release()
+
+
+def test_read_many_shared_memory_windows(monkeypatch):
+    monkeypatch.setattr(os, "name", "nt")
+    with pytest.raises(ValueError):
+        read_many([], shared_memory=True)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shared memory")
+def test_shared_memory_internals(monkeypatch):
+    # the details of multiprocessing.shared_memory that _mapblock relies on
+    tracked = []
+    monkeypatch.setattr(resource_tracker, "register", lambda *a: tracked.append(a))
+    monkeypatch.setattr(resource_tracker, "unregister", lambda *a: tracked.remove(a))
+    shm = shared_memory.SharedMemory(create=True, size=16)
+    try:
+        assert isinstance(shm._fd, int)  # pylint: disable=protected-access
+        assert tracked == [("/" + shm.name, "shared_memory")]
+        if sys.version_info < (3, 13):
+            import _posixshmem  # pylint: disable=import-outside-toplevel,import-error
+
+            os.close(_posixshmem.shm_open("/" + shm.name, os.O_RDWR, mode=0o600))
+    finally:
+        shm.close()
+        shm.unlink()
+    assert not tracked
+
+
+def _attach_sum(handle):
+    data = DCBase.from_shared_memory(handle)
+    total = float(data.Voltage.sum())
+    data.release()
+    return total
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_shared_memory_process(method):
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"start method '{method}' not available")
+    data = read_csv(data_dir.joinpath("column header data labels.csv"))
+    handle = data.to_shared_memory()
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(1, mp_context=context) as ex:
+        assert ex.submit(_attach_sum, handle).result() == 285
+    # the worker neither freed the block nor dropped it from the resource tracker
+    other = DataContainer.from_shared_memory(handle)
+    assert allclose_units(other.Voltage, unyt_array(np.arange(10) ** 2, "V"))
+    other.release()
+    data.release()
+    with pytest.raises(FileNotFoundError):
+        DataContainer.from_shared_memory(handle)
@@ -0,0 +1,50 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+from unyt import unyt_array
+from unyt.testing import allclose_units
+from toolbag import find_crossings, measure_edges
+
+
+def trapezoid(t, frequency=1e3, duty=0.3, edge=20e-6):
+    # rises from 0 to 1 in 'edge' at the start of each period
+    phase = t * frequency % 1
+    slope = frequency * edge
+    return np.clip(np.minimum(phase / slope, (duty + slope - phase) / slope), 0, 1)
+
+
+def test_find_crossings():
+    y = [0, 1, 2, 1, 0, 1, 2]
+    rising, falling = find_crossings(y, 1.5)
+    assert np.allclose(rising, [1.5, 5.5])
+    assert np.allclose(falling, [2.5])
+    rising, falling = find_crossings(y, 1.5, x=np.arange(7) * 0.1)
+    assert np.allclose(rising, [0.15, 0.55])
+    rising, falling = find_crossings([0, 0, 0], 1.5)
+    assert rising.size == 0 and falling.size == 0
+
+
+def test_find_crossings_hysteresis():
+    t = np.arange(0, 10e-3, 1e-6)
+    rng = np.random.default_rng(0)
+    y = trapezoid(t) + 0.05 * rng.standard_normal(t.size)
+    rising, falling = find_crossings(y, 0.5)
+    assert len(rising) > 10
+    rising, falling = find_crossings(y, 0.5, hysteresis=0.4, x=t)
+    assert np.allclose(rising, np.arange(10) * 1e-3 + 10e-6, atol=4e-6)
+    assert np.allclose(falling, np.arange(10) * 1e-3 + 310e-6, atol=4e-6)
+
+
+def test_measure_edges():
+    t = np.arange(0, 10e-3, 1e-6)
+    y = unyt_array(trapezoid(t), "V")
+    edges = measure_edges(y, unyt_array(t, "s"))
+    assert allclose_units(edges.rising, unyt_array(np.arange(10) * 1e-3 + 10e-6, "s"))
+    assert allclose_units(edges.period, unyt_array(np.full(9, 1e-3), "s"))
+    assert allclose_units(edges.frequency, unyt_array(np.full(9, 1e3), "Hz"))
+    assert np.allclose(edges.duty_cycle, 0.3)
+    assert allclose_units(edges.rise_time, unyt_array(np.full(10, 16e-6), "s"))
+    assert allclose_units(edges.fall_time, unyt_array(np.full(10, 16e-6), "s"))
+    edges = measure_edges(trapezoid(t)[:100])
+    assert edges.period.size == 0
+    assert np.isnan(edges.fall_time).all()
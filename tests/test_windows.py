@@ -0,0 +1,29 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+from toolbag import extract_singletone
+from toolbag.windows import get_window
+
+
+def test_get_window():
+    window = get_window("gaussian", 1000)
+    assert window is get_window(("gaussian", 0.2), 1000)
+    assert not window.values.flags.writeable
+    assert np.isclose(window.coherent_gain, window.values.mean())
+    assert window is not get_window(("gaussian", 0.3), 1000)
+    assert np.isclose(get_window("rectangular", 8).enbw, 1.0)
+    assert np.isclose(get_window("hann", 4097).enbw, 1.5, rtol=1e-3)
+    assert np.isclose(get_window("blackmanharris", 4097).enbw, 2.0044, rtol=1e-3)
+    assert np.isclose(get_window("flattop", 4097).enbw, 3.7702, rtol=1e-3)
+    with pytest.raises(ValueError):
+        get_window("unknown", 8)
+
+
+def test_extract_singletone_window():
+    fs = 5000  # S/s
+    t = np.arange(0, 2, 1 / fs)
+    y = 1.101 * np.sin(2 * np.pi * 2000.001 * t)
+    f, amp = extract_singletone(y, fs, window="flattop")
+    assert np.isclose(f, 2000.001, rtol=1e-6)
+    assert np.isclose(amp, 1.101, rtol=1e-3)
@@ -1,9 +1,15 @@
 """Test write_csv"""
 import tempfile
 import os
+import pathlib
+from io import StringIO
+import pytest
+import numpy as np
 from unyt import unyt_array
 from unyt.testing import allclose_units
-from toolbag import write_csv, read_csv
+from toolbag import write_csv, read_csv, read_ltraw, read_ltxt, CSVAppender
+
+data_dir = pathlib.Path("tests/data files")
 
 # pylint:disable=missing-function-docstring
 def test_rowheader():
@@ -26,3 +32,118 @@ def test_append():
     readback = read_csv(file.name)
     assert allclose_units(readback.loss, unyt_array([4, 5], "dB"))
     os.remove(file.name)
+
+
+def test_array(tmp_path):
+    file = tmp_path.joinpath("array.csv")
+    data = np.random.default_rng(0).standard_normal((1000, 3))
+    data[0] = [np.nan, np.inf, -np.inf]
+    write_csv(file, data)
+    readback = read_csv(file)
+    assert np.array_equal(readback, data, equal_nan=True)
+    write_csv(file, data, float_format="%.3f")
+    assert file.read_text().splitlines()[1] == ",".join(f"{v:.3f}" for v in data[1])
+    data = data.astype(np.float32)
+    write_csv(file, data)
+    readback = read_csv(file)
+    assert np.array_equal(readback.astype(np.float32), data, equal_nan=True)
+    write_csv(file, np.array([[0.1, 1e-30]], dtype=np.float32))
+    assert file.read_text() == "0.1,1e-30\n"
+
+
+def test_si(tmp_path):
+    file = tmp_path.joinpath("si.csv")
+    data = np.array([[1.5e3, -2.2e-6, 0.0], [4.7e9, 12.0, np.nan]])
+    write_csv(file, data, si=True)
+    assert file.read_text().splitlines()[0] == "1.5k,-2.2u,0.0"
+    assert np.allclose(read_csv(file), data, equal_nan=True)
+    data = np.array([[1500, -7], [12, 0]])
+    write_csv(file, data, si=True)
+    assert file.read_text().splitlines() == ["1.5k,-7.0", "12.0,0.0"]
+    data = np.array([[3.3e-6, 4.7e-9, 1e-24], [1e-30, -2e-27, 1e30]])
+    write_csv(file, data, si=True)
+    lines = file.read_text().splitlines()
+    assert lines == ["3.3u,4.7n,1.0y", "1e-30,-2e-27,1e+30"]
+    assert np.allclose(read_csv(file), data, rtol=1e-15, atol=0)
+
+
+def test_datacontainer(tmp_path):
+    file = tmp_path.joinpath("container.csv")
+    data = read_csv(StringIO("My data\nTime (s),Voltage (V)\n0,1p\n1,2p\n2,3p"))
+    write_csv(file, data)
+    readback = read_csv(file)
+    assert readback.header == "My data"
+    assert readback.columns == ["Time (s)", "Voltage (V)"]
+    assert allclose_units(readback.Voltage, unyt_array([1e-12, 2e-12, 3e-12], "V"))
+
+
+def test_ltraw(tmp_path):
+    sim = read_ltraw(data_dir.joinpath("vsource ac.raw"))
+    write_csv(tmp_path / "sim.csv", sim)
+    data = read_csv(tmp_path / "sim.csv")
+    assert data.header == ""
+    assert data.columns[:3] == ["frequency", "V(v1).real", "V(v1).imag"]
+    assert np.allclose(data["I(C1).imag"].value, sim["I(C1)"].imag.value)
+
+
+def test_ltxt(tmp_path):
+    trace = read_ltxt(data_dir.joinpath("frequency dB_deg.txt"))
+    write_csv(tmp_path / "trace.csv", trace)
+    data = read_csv(tmp_path / "trace.csv")
+    assert data.header == ""
+    assert "V(out).magnitude" in data and "V(out).phase" in data
+    assert np.allclose(data["V(out).phase"].value, trace.V_out[1].value)
+
+
+def test_appender(tmp_path):
+    file = tmp_path.joinpath("log.csv")
+    labels = ["Time (s)", "Voltage (V)"]
+    with CSVAppender(file, 2, header="My log", labels=labels, buffer_rows=4) as log:
+        log.append([0, 1.5])
+        assert file.read_text() == "My log\nTime (s),Voltage (V)\n"
+        log.append([[1, 2.5], [2, 3.5], [3, 4.5], [4, 5.5]])
+        # the buffer of 4 rows was flushed
+        assert allclose_units(read_csv(file).Time, unyt_array([0, 1, 2, 3], "s"))
+        log.flush()
+        assert allclose_units(read_csv(file).Time, unyt_array([0, 1, 2, 3, 4], "s"))
+        log.append([5, 6.5])
+    readback = read_csv(file)
+    assert readback.header == "My log"
+    assert allclose_units(readback.Voltage, unyt_array(np.arange(6) + 1.5, "V"))
+    with CSVAppender(file, 2, labels=labels, flush_interval=0) as log:
+        log.append([6, 7.5])
+        assert allclose_units(read_csv(file).Time, unyt_array(np.arange(7), "s"))
+
+
+def test_appender_rotate(tmp_path):
+    file = tmp_path.joinpath("log.csv")
+    labels = ["Time (s)", "Voltage (V)"]
+    with CSVAppender(file, 2, labels=labels, buffer_rows=10, max_bytes=100) as log:
+        log.append(np.arange(60).reshape((-1, 2)))
+    assert log.files == [file] + [tmp_path.joinpath(f"log.{i}.csv") for i in [1, 2]]
+    time = np.concatenate([read_csv(f).Time.value for f in log.files])
+    assert np.array_equal(time, np.arange(0, 60, 2))
+    with pytest.raises(ValueError):
+        log.append([0, 1])
+
+
+def test_appender_rotate_reopen(tmp_path):
+    file = tmp_path.joinpath("log.csv")
+    rows = np.arange(120).reshape((-1, 2))
+    sessions = []
+    for session in [rows[:30], rows[30:]]:
+        with CSVAppender(file, 2, buffer_rows=10, max_bytes=100) as log:
+            log.append(session)
+        sessions.append(log.files)
+    # the second session continues in the last file of the first one
+    assert len(sessions[0]) > 1 and sessions[1][0] == sessions[0][-1]
+    files = sorted(tmp_path.glob("log.*.csv"), key=lambda f: int(f.suffixes[0][1:]))
+    values = np.concatenate([read_csv(f) for f in [file] + files])
+    assert np.array_equal(values, rows)
+    # overwriting starts a new set of files
+    with CSVAppender(file, 2, mode="w", buffer_rows=10, max_bytes=100) as log:
+        log.append(rows[:30])
+    assert log.files == sessions[0]
+    files = sorted(tmp_path.glob("log.*.csv"), key=lambda f: int(f.suffixes[0][1:]))
+    assert [file] + files == log.files
+    assert np.array_equal(np.concatenate([read_csv(f) for f in log.files]), rows[:30])
@@ -5,16 +5,25 @@ from toolbag.labview_utilities import (
     ReadCSV,
     convert_timestamp,
     write_csv,
+    CSVAppender,
     threshold_1d,
     interpolate_1d,
 )
 from toolbag.ltspice_utilities import ReadLTxt, ReadLTraw
 from toolbag.mentor_utilities import ReadPAF
-from toolbag.mpl_utilities import reset_plot
+from toolbag.mpl_utilities import reset_plot, plot_envelope
 from toolbag.common import format_as_si
 from toolbag.version import __version__
-from toolbag.extract_singletone import extract_singletone
+from toolbag.extract_singletone import (
+    extract_singletone,
+    extract_singletones,
+    track_singletone,
+)
+from toolbag.analyze_spectrum import analyze_spectrum
 from toolbag.awr_utilities import ReadTraceData
+from toolbag.waveform_utilities import find_crossings, measure_edges
+from toolbag.cache import enable_cache, disable_cache, clear_cache
+from toolbag.read_many import read_many
 
 __all__ = [
     "__version__",
@@ -25,14 +34,24 @@ __all__ = [
     "read_paf",
     "reset_plot",
     "write_csv",
+    "CSVAppender",
     "dBm",
     "format_as_si",
     "extract_singletone",
+    "extract_singletones",
+    "track_singletone",
+    "analyze_spectrum",
+    "find_crossings",
+    "measure_edges",
     "read_awr_tracedata",
     "threshold_1d",
     "dBc",
     "interpolate_1d",
     "rf_power",
+    "enable_cache",
+    "disable_cache",
+    "clear_cache",
+    "read_many",
 ]
 
 
@@ -0,0 +1,159 @@
+"""Analyze spectrum
+
+Dynamic performance metrics of a sampled single tone as defined for ADCs in
+IEEE Std 1241, computed from one windowed spectrum of each record.
+"""
+from collections import namedtuple
+import numpy as np
+from toolbag.windows import get_window
+
+__all__ = ["analyze_spectrum", "SpectrumMetrics"]
+
+SpectrumMetrics = namedtuple(
+    "SpectrumMetrics",
+    [
+        "frequency",
+        "amplitude",
+        "harmonic_frequency",
+        "harmonic_amplitude",
+        "spur_frequency",
+        "spur_amplitude",
+        "snr",
+        "thd",
+        "sfdr",
+        "sinad",
+        "enob",
+    ],
+)
+SpectrumMetrics.__doc__ = """Spectrum metrics of each record
+
+Attributes
+----------
+    frequency: ndarray frequency of the fundamental
+    amplitude: ndarray amplitude of the fundamental
+    harmonic_frequency: ndarray (records x harmonics) aliased harmonic frequency
+    harmonic_amplitude: ndarray (records x harmonics)
+    spur_frequency: ndarray (records x spurs) frequency of the largest spurs
+        that aren't harmonics
+    spur_amplitude: ndarray (records x spurs)
+    snr: ndarray signal to noise ratio in dB
+    thd: ndarray total harmonic distortion in dBc
+    sfdr: ndarray spurious free dynamic range in dBc
+    sinad: ndarray signal to noise and distortion ratio in dB
+    enob: ndarray effective number of bits
+"""
+
+
+def _lobes(power, bins, leakage):
+    """Power of the lobes of 'leakage' bins either side of 'bins'"""
+    offsets = np.arange(-leakage, leakage + 1)
+    index = np.clip(bins[..., np.newaxis] + offsets, 0, power.shape[-1] - 1)
+    lobes = np.take_along_axis(power, index.reshape(len(power), -1), axis=-1)
+    return lobes.reshape(index.shape).sum(axis=-1), index.reshape(len(power), -1)
+
+
+def analyze_spectrum(
+    x, fs, n_harmonics=5, n_spurs=1, window="blackmanharris", leakage=None
+):
+    """Analyze the spectrum of a single tone in each of many records
+
+    Computes one windowed spectrum of each record along the last axis of 'x' and
+    extracts the fundamental, which is the largest tone, its harmonics aliased
+    into the first Nyquist zone and the largest remaining spurs. The power of a
+    tone is the sum of the bins of its lobe. Noise is the remaining power without
+    DC, the fundamental and its harmonics. Bins that are part of a lobe count
+    only once.
+
+    Parameters
+    ----------
+    x : array-like
+        real time domain records (records x samples)
+    fs : float
+        sample frequency
+    n_harmonics : int
+        number of harmonics starting at the 2nd
+    n_spurs : int
+        number of spurs other than the harmonics
+    window : str or tuple
+        FFT window, see toolbag.windows.get_window
+    leakage : int
+        half width of the lobe of a tone in bins, defaults to twice the
+        equivalent noise bandwidth of the window
+
+    Returns
+    -------
+    SpectrumMetrics
+        namedtuple of ndarray with the shape of the records
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    x = np.asarray(x, dtype=np.float64)
+    shape = x.shape[:-1]
+    x = x.reshape((-1, x.shape[-1]))
+    n_samples = x.shape[-1]
+    df = fs / n_samples
+    window, _, enbw = get_window(window, n_samples)
+    if leakage is None:
+        leakage = int(np.ceil(2 * enbw))
+    spectrum = np.abs(np.fft.rfft(x * window))
+    # mean square value of a sinusoid per bin
+    power = 2 * spectrum ** 2 / (n_samples * (window ** 2).sum())
+    available = np.ones(power.shape, dtype=bool)
+    available[:, : leakage + 1] = False
+    rows = np.arange(len(power))[:, np.newaxis]
+
+    # fundamental with quadratic interpolation of the peak
+    tone_bin = np.where(available, spectrum, 0).argmax(axis=-1)[:, np.newaxis]
+    neighbours = np.minimum(tone_bin + [-1, 0, 1], n_samples // 2)
+    a, b, g = np.log10(np.take_along_axis(spectrum, neighbours, axis=-1)).T
+    p = (a - g) / (2 * (a - 2 * b + g))
+    frequency = (tone_bin[:, 0] + p) * df
+    signal, index = _lobes(power, tone_bin, leakage)
+    available[rows, index] = False
+
+    # harmonics folded into the first Nyquist zone
+    order = np.arange(2, n_harmonics + 2)
+    harmonic_frequency = np.multiply.outer(frequency, order) % fs
+    harmonic_frequency = np.where(
+        harmonic_frequency > fs / 2, fs - harmonic_frequency, harmonic_frequency
+    )
+    harmonic_bin = np.rint(harmonic_frequency / df).astype(int)
+    harmonics = np.zeros((len(power), n_harmonics))
+    for i in range(n_harmonics):
+        # aliased harmonics may share a lobe, which counts for the lower order
+        lobe, index = _lobes(
+            np.where(available, power, 0), harmonic_bin[:, i : i + 1], leakage
+        )
+        harmonics[:, i] = lobe[:, 0]
+        available[rows, index] = False
+    noise = np.where(available, power, 0).sum(axis=-1)
+    # masked bins are replaced by the average noise per bin
+    noise *= (power.shape[-1] - leakage - 1) / available.sum(axis=-1)
+
+    # largest spurs other than the harmonics
+    spur_bin = np.zeros((len(power), n_spurs), dtype=int)
+    spurs = np.zeros((len(power), n_spurs))
+    for i in range(n_spurs):
+        remaining = np.where(available, power, 0)
+        spur_bin[:, i] = remaining.argmax(axis=-1)
+        lobe, index = _lobes(remaining, spur_bin[:, i : i + 1], leakage)
+        spurs[:, i] = lobe[:, 0]
+        available[rows, index] = False
+
+    signal = signal[:, 0]
+    distortion = harmonics.sum(axis=-1)
+    largest = np.max(np.concatenate([harmonics, spurs], axis=-1), axis=-1, initial=0)
+    sinad = 10 * np.log10(signal / (noise + distortion))
+    metrics = SpectrumMetrics(
+        frequency,
+        np.sqrt(2 * signal),
+        harmonic_frequency,
+        np.sqrt(2 * harmonics),
+        spur_bin * df,
+        np.sqrt(2 * spurs),
+        10 * np.log10(signal / noise),
+        10 * np.log10(distortion / signal),
+        10 * np.log10(signal / largest),
+        sinad,
+        (sinad - 1.76) / 6.02,
+    )
+    return SpectrumMetrics(*[np.reshape(m, shape + np.shape(m)[1:]) for m in metrics])
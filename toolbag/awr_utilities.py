@@ -2,6 +2,7 @@
 import re
 import numpy as np
 from toolbag.common import Error, singleton, DataLabel, DCBase
+from toolbag.cache import cached
 
 # regex pattern for mantissa of numeric value
 P1 = r"[+-]?[0-9]+\.?[0-9]*"
@@ -11,21 +12,8 @@ NUMBER = f"^(?P<mantissa>{P1})(?P<exponent>{P2})?$"
 VALIDIDENTIFIER = "^[a-zA-Z][a-zA-Z0-9_]*$"
 
 
-@singleton
-class ReadTraceData:
-    """Read AWR generated text files containing graph trace data
-
-    Parameters
-    ----------
-    file : file descriptor, str, or path-like
-    """
-
-    def _initialize_attributes(self):
-        """Initialize attributes for subsequent calls."""
-        self._rawtdv = []
-        self.header = ""
-        self.labels = []
-        self.data = []
+class _TraceDataParser:
+    """Parse state of one call to read_awr_tracedata"""
 
     def __init__(self):
         self._rawtdv = []
@@ -41,8 +29,15 @@ class ReadTraceData:
             value = float(mantissa + exponent)
         return value
 
-    def __call__(self, file):
-        self._initialize_attributes()
+    def _restore(self, data, meta):
+        """Restore the parse state from the parse cache"""
+        self.data = data
+        self.header = meta["header"]
+        self.labels = meta["labels"]
+
+    @cached
+    def parse(self, file):
+        """Parse the trace data file"""
         try:
             for line in file.readlines():
                 self._rawtdv.append(line.strip().split("\t"))
@@ -60,9 +55,50 @@ class ReadTraceData:
                     raise Error(f"Non numeric value '{column}' found in data array")
                 row.append(self._parsenumber(*match.groups()))
             self.data.append(row)
-        self.data = np.transpose(self.data)
+        # store each trace contiguously
+        self.data = np.ascontiguousarray(np.transpose(self.data))
         return DataContainer(self.data, self.labels, header=self.header)
 
+
+@singleton
+class ReadTraceData:
+    """Read AWR generated text files containing graph trace data
+
+    Parameters
+    ----------
+    file : file descriptor, str, or path-like
+
+    Attributes
+    ----------
+    data : ndarray of the last file read
+    header : str of the last file read
+    labels : list of DataLabel of the last file read
+    """
+
+    def __init__(self):
+        self._last = _TraceDataParser()
+
+    @property
+    def data(self):
+        """Numerical values of the last file read"""
+        return self._last.data
+
+    @property
+    def header(self):
+        """Header of the last file read"""
+        return self._last.header
+
+    @property
+    def labels(self):
+        """Data labels of the last file read"""
+        return self._last.labels
+
+    def __call__(self, file):
+        parser = _TraceDataParser()
+        result = parser.parse(file)
+        self._last = parser
+        return result
+
     def __dir__(self):
         return list(filter(lambda s: not s.startswith("_"), super().__dir__()))
 
@@ -102,34 +138,8 @@ class DataContainer(DCBase):
                     self._valid_identifiers.append(f'["{axis.label}"]')
             self.legends.append(axis.legend)
 
-    def __getitem__(self, item):
-        try:
-            return self._item_cache[item]
-        except KeyError:
-            labels = [axis.label for axis in self._labels]
-            names = [axis.name for axis in self._labels]
-            if isinstance(item, int):
-                self._item_cache[item] = self._data[item]
-            elif isinstance(item, str):
-                try:
-                    i = names.index(item)
-                except ValueError:
-                    try:
-                        i = labels.index(item)
-                    except ValueError:
-                        raise KeyError(f"{item}") from None
-                self._item_cache[item] = self._data[i]
-            else:
-                raise KeyError(f"{item}") from None
-            return self._item_cache[item]
-        except TypeError:
-            if isinstance(item, slice):
-                rows = self._data.shape[0]
-                start = item.start if item.start is not None else 0
-                stop = item.stop if item.stop is not None else rows
-                step = item.step if item.step is not None else 1
-                return [self[i] for i in range(start, stop, step)]
-            raise KeyError(f"{item}") from None
+    def _makeitem(self, i):
+        return self._data[i]
 
     @property
     def columns(self):
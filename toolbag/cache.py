@@ -0,0 +1,222 @@
+"""On-disk cache of parsed files
+
+The cache is opt-in and stores the parsed array of a file in numpy's binary format
+alongside its data labels and header. A repeated read of an unchanged file memory
+maps the stored array instead of parsing the source text again.
+"""
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+import numpy as np
+from toolbag.common import DCBase
+from toolbag.version import __version__
+
+__all__ = ["ParseCache", "enable_cache", "disable_cache", "clear_cache"]
+
+
+def _default_directory():
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if base is None:
+        base = pathlib.Path.home().joinpath(".cache")
+    return pathlib.Path(base).joinpath("toolbag")
+
+
+def _digest(path):
+    """Hash the content of file 'path'"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while block := f.read(2 ** 20):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded on-disk cache of parsed files.
+
+    An entry is keyed by the reader and the resolved file path and is valid while
+    the size and modification time of the file are unchanged. If only the
+    modification time changed, the content hash decides whether the entry is still
+    valid. The least recently used entries are evicted to keep the total size of
+    the cache below 'max_size'.
+
+    Parameters
+    ----------
+        directory: str or pathlib.Path
+        max_size: int maximum size in bytes
+    """
+
+    def __init__(self, directory=None, max_size=2 ** 30):
+        if directory is None:
+            directory = _default_directory()
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    @staticmethod
+    def _pathkey(path):
+        path = str(pathlib.Path(path).resolve())
+        return hashlib.blake2b(path.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _entry(self, reader, path):
+        stem = f"{self._pathkey(path)}-{reader}"
+        return self.directory.joinpath(stem + ".npy"), self.directory.joinpath(
+            stem + ".pkl"
+        )
+
+    def load(self, reader, path):
+        """Load the cached result of 'reader' for file 'path'
+
+        Returns
+        -------
+            (data, meta) if the entry is valid otherwise None
+        """
+        data_file, meta_file = self._entry(reader, path)
+        try:
+            with open(meta_file, "rb") as f:
+                meta = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if meta["version"] != __version__:
+            return None
+        stat = os.stat(path)
+        if meta["stat"] != (stat.st_size, stat.st_mtime_ns):
+            if meta["stat"][0] != stat.st_size or meta["digest"] != _digest(path):
+                return None
+            meta["stat"] = (stat.st_size, stat.st_mtime_ns)
+            self._write(meta_file, lambda f: pickle.dump(meta, f))
+        try:
+            data = np.load(data_file, mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+        os.utime(data_file)
+        return data, meta
+
+    def store(self, reader, path, data, meta):
+        """Store the parsed 'data' and 'meta' of file 'path' read by 'reader'"""
+        data = np.asarray(data)
+        if data.dtype == object:
+            # ragged arrays can't be memory mapped
+            return
+        stat = os.stat(path)
+        meta = dict(
+            meta,
+            version=__version__,
+            stat=(stat.st_size, stat.st_mtime_ns),
+            digest=_digest(path),
+        )
+        data_file, meta_file = self._entry(reader, path)
+        self._write(data_file, lambda f: np.save(f, data))
+        self._write(meta_file, lambda f: pickle.dump(meta, f))
+        self._evict()
+
+    def _write(self, file, write):
+        """Write 'file' atomically"""
+        fd, name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(name, file)
+        except BaseException:
+            os.remove(name)
+            raise
+
+    def _evict(self):
+        entries = []
+        for data_file in self.directory.glob("*.npy"):
+            meta_file = data_file.with_suffix(".pkl")
+            try:
+                stat = data_file.stat()
+                size = stat.st_size + meta_file.stat().st_size
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, size, data_file, meta_file))
+        total = sum(entry[1] for entry in entries)
+        for _, size, data_file, meta_file in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(data_file, meta_file)
+            total -= size
+
+    @staticmethod
+    def _remove(*files):
+        for file in files:
+            try:
+                os.remove(file)
+            except OSError:
+                # memory mapped on Windows or already removed
+                pass
+
+    def invalidate(self, path=None):
+        """Remove the entries of file 'path' or all entries if 'path' is None"""
+        pattern = "*" if path is None else f"{self._pathkey(path)}-*"
+        for file in self.directory.glob(pattern):
+            if file.suffix in [".npy", ".pkl"]:
+                self._remove(file)
+
+    def __repr__(self):
+        return f"<ParseCache '{self.directory}'>"
+
+
+_cache = None  # pylint: disable=invalid-name
+
+
+def enable_cache(directory=None, max_size=2 ** 30):
+    """Enable the on-disk cache of parsed files for all readers
+
+    Parameters
+    ----------
+        directory: str or pathlib.Path
+            defaults to the user's cache directory
+        max_size: int maximum size in bytes
+
+    Returns
+    -------
+        ParseCache
+    """
+    global _cache  # pylint: disable=global-statement
+    _cache = ParseCache(directory, max_size)
+    return _cache
+
+
+def disable_cache():
+    """Disable the on-disk cache of parsed files"""
+    global _cache  # pylint: disable=global-statement
+    _cache = None  # pylint: disable=invalid-name
+
+
+def clear_cache(path=None):
+    """Remove the cached entries of file 'path' or all entries if 'path' is None"""
+    if _cache is not None:
+        _cache.invalidate(path)
+
+
+def cached(method):
+    """Decorator for a parser's parse method to look up and store parsed files"""
+
+    # pylint: disable=protected-access
+    @functools.wraps(method)
+    def wrapper(self, file, *args, **kwargs):
+        ispath = isinstance(file, (str, os.PathLike))
+        if _cache is None or args or kwargs or not ispath:
+            return method(self, file, *args, **kwargs)
+        reader = type(self).__name__
+        if (entry := _cache.load(reader, file)) is not None:
+            data, meta = entry
+            if hasattr(self, "_restore"):
+                self._restore(data, meta)
+            if meta["cls"] is None:
+                return data
+            return meta["cls"](data, meta["labels"], header=meta["header"])
+        result = method(self, file, *args, **kwargs)
+        if isinstance(result, DCBase):
+            meta = {"cls": type(result), "labels": result._labels}
+            _cache.store(reader, file, result._data, dict(meta, header=result.header))
+        else:
+            meta = {"cls": None, "labels": [], "header": getattr(self, "header", "")}
+            _cache.store(reader, file, result, meta)
+        return result
+
+    return wrapper
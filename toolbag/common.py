@@ -1,7 +1,12 @@
 """Common definitions"""
 import functools
-from collections import namedtuple
+import json
+import mmap
+import os
+import sys
+from collections import namedtuple, OrderedDict
 from enum import Enum
+from multiprocessing import shared_memory, resource_tracker
 import numpy as np
 
 
@@ -19,6 +24,9 @@ def singleton(cls):
         return single_cls.instance
 
     single_cls.instance = None
+    # pickle the instance as a call to the module level callable to get the
+    # singleton of the receiving process
+    cls.__reduce__ = lambda self: (single_cls, ())
     return single_cls
 
 
@@ -34,6 +42,89 @@ class ArrayOrientation(Enum):
     UNKNOWN = 2
 
 
+SharedHandle = namedtuple(
+    "SharedHandle", ["name", "dtype", "shape", "labels", "header", "cls"]
+)
+SharedHandle.__doc__ = """Handle of a DataContainer in shared memory
+
+Attributes
+----------
+    name: str name of the shared memory block
+    dtype: str dtype of the data array
+    shape: tuple shape of the data array
+    labels: list of DataLabel
+    header: header of the container
+    cls: class of the container
+"""
+
+
+def _mapblock(name, size, track):
+    """Map a new shared memory block if 'name' is None or else the block 'name'
+
+    All version and platform specific handling of shared memory is here because
+    the public SharedMemory API doesn't fit in two ways. First, close() and garbage
+    collection unmap its buffer even while numpy arrays still use it, so the arrays
+    get a mapping of their own. Second, before Python 3.13 SharedMemory registers
+    every attach with the resource tracker and has no 'track' option. Forked
+    workers share the tracker of their parent, which keeps one entry per name, so
+    unregistering an attach would also drop the entry of the owner. An attach
+    without tracking therefore opens the block directly. The private parts used,
+    SharedMemory._fd and _posixshmem, are pinned by tests/test_read_many.py.
+
+    Returns
+    -------
+        (mmap, name of the block)
+    """
+    # pylint: disable=protected-access
+    legacy = sys.version_info < (3, 13)
+    if legacy and os.name != "nt" and name is not None and not track:
+        import _posixshmem  # pylint: disable=import-outside-toplevel,import-error
+
+        fd = _posixshmem.shm_open("/" + name, os.O_RDWR, mode=0o600)
+        try:
+            return mmap.mmap(fd, size), name
+        finally:
+            os.close(fd)
+    if legacy:
+        shm = shared_memory.SharedMemory(name, create=name is None, size=size)
+        if os.name != "nt" and not track:
+            resource_tracker.unregister("/" + shm.name, "shared_memory")
+    else:
+        # pylint: disable=unexpected-keyword-arg
+        shm = shared_memory.SharedMemory(
+            name, create=name is None, size=size, track=track
+        )
+    if os.name == "nt":
+        buffer = mmap.mmap(-1, size, tagname=shm.name)
+    else:
+        buffer = mmap.mmap(shm._fd, size)
+    shm.close()
+    return buffer, shm.name
+
+
+def _sharedarray(shape, dtype, name=None, track=True):
+    """Array in a new or existing shared memory block
+
+    The array stays valid until it's deleted. With 'track' False, the resource
+    tracker of this process doesn't free the block when the process exits.
+
+    Returns
+    -------
+        (ndarray, name of the block)
+    """
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    buffer, name = _mapblock(name, size, track)
+    return np.ndarray(shape, dtype, buffer=buffer), name
+
+
+def _unlink(name):
+    """Free the shared memory block 'name' once it's no longer mapped"""
+    shm = shared_memory.SharedMemory(name)
+    shm.close()
+    shm.unlink()
+
+
 class DCBase:
     """DataContainer holds the parsed content of a text or CSV file.
 
@@ -50,23 +141,47 @@ class DCBase:
     ----------
         header: string
         legends: list of strings
+        cache_budget: int or None
+            maximum size in bytes of the cached columns, the least recently used
+            columns are evicted first
         <name>: unyt_array
     """
 
+    # pylint: disable=too-many-instance-attributes
+    # DataLabel fields to look up an item by in order of priority
+    _lookup_fields = ("name", "label")
+
     def __init__(self, data, labels, *, header=""):
         self._data = data
         self.header = header
         self._labels = labels
         self._valid_identifiers = []
-        self._item_cache = {}
+        self._item_cache = OrderedDict()
+        self._cache_size = 0
+        self.cache_budget = None
         self.legends = []
+        self._shm = None
+        self._shm_owner = False
         self._parselabels()
         self._objstr = str(self.__class__).split(".")[-1].strip("'>")
+        self._index = {}
+        for field in self._lookup_fields:
+            for i, axis in enumerate(self._labels):
+                key = getattr(axis, field)
+                if key is not None:
+                    self._index.setdefault(key, i)
 
     def _parselabels(self):
         raise NotImplementedError
 
+    def _makeitem(self, i):
+        """Make the item of column 'i'"""
+        raise NotImplementedError
+
     def __getattr__(self, name):
+        if name.startswith("_"):
+            # private attributes aren't set yet while unpickling or copying
+            raise AttributeError(name)
         try:
             return self[name]
         except KeyError:
@@ -74,8 +189,42 @@ class DCBase:
                 f"'{self._objstr}' object has no attribute '{name}'"
             ) from None
 
+    def _lookup(self, item):
+        """Index of the column of 'item'"""
+        if isinstance(item, (int, np.integer)):
+            try:
+                return range(len(self._labels))[item]
+            except IndexError:
+                raise IndexError(f"{self._objstr} index out of range") from None
+        try:
+            return self._index[item]
+        except (KeyError, TypeError):
+            raise KeyError(f"{item}") from None
+
     def __getitem__(self, item):
-        raise NotImplementedError
+        if isinstance(item, slice):
+            return [self[i] for i in range(len(self._labels))[item]]
+        i = self._lookup(item)
+        try:
+            self._item_cache.move_to_end(i)
+            return self._item_cache[i]
+        except KeyError:
+            pass
+        value = self._makeitem(i)
+        self._item_cache[i] = value
+        self._cache_size += self._nbytes(value)
+        while self.cache_budget is not None and self._cache_size > self.cache_budget:
+            if len(self._item_cache) == 1:
+                break
+            _, evicted = self._item_cache.popitem(last=False)
+            self._cache_size -= self._nbytes(evicted)
+        return value
+
+    @staticmethod
+    def _nbytes(value):
+        if isinstance(value, (list, tuple)):
+            return sum(np.asarray(v).nbytes for v in value)
+        return np.asarray(value).nbytes
 
     def __len__(self):
         return len(self._data)
@@ -87,9 +236,153 @@ class DCBase:
         raise TypeError(f"'{self._objstr}' does not support item deletion")
 
     def __contains__(self, item):
-        labels = [axis.label for axis in self._labels]
-        names = [axis.name for axis in self._labels]
-        return item in labels + names
+        try:
+            return item in self._index
+        except TypeError:
+            return False
+
+    def _export(self, i):
+        """Columns of item 'i' as list of (key, ndarray, metadata)"""
+        axis = self._labels[i]
+        value = self[i]
+        unit = getattr(value, "units", axis.unit)
+        return [(axis.label, np.asarray(value), self._metadata(axis, unit))]
+
+    @staticmethod
+    def _metadata(axis, unit):
+        metadata = {"unit": unit, "name": axis.name, "legend": axis.legend}
+        metadata = {k: str(v) for k, v in metadata.items() if v is not None}
+        return {k: v for k, v in metadata.items() if v}
+
+    def _exportcolumns(self):
+        return [c for i in range(len(self._labels)) for c in self._export(i)]
+
+    def to_dict_of_arrays(self):
+        """Return the columns as dict of ndarray keyed by data label
+
+        The arrays are views of the underlying data array without units wherever
+        the layout allows.
+        """
+        return {key: values for key, values, _ in self._exportcolumns()}
+
+    def to_pandas(self):
+        """Return the columns as pandas.DataFrame without copying the data
+
+        The units, names and legends of the columns are in the 'attrs' of the
+        DataFrame as dict keyed by column and the header as 'header'.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        columns = self._exportcolumns()
+        df = pd.DataFrame({key: values for key, values, _ in columns}, copy=False)
+        df.attrs["header"] = self.header
+        for field in ["unit", "name", "legend"]:
+            df.attrs[field + "s"] = {
+                key: metadata[field]
+                for key, _, metadata in columns
+                if field in metadata
+            }
+        return df
+
+    def to_arrow(self):
+        """Return the columns as pyarrow.Table without copying the data
+
+        The units, names and legends are in the metadata of the fields and the
+        header is in the metadata of the schema. Arrow has no complex type, so a
+        complex column is a fixed size list of (real, imag).
+        """
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        arrays, fields = [], []
+        for key, values, metadata in self._exportcolumns():
+            if np.iscomplexobj(values):
+                parts = pa.array(np.ascontiguousarray(values).view(values.real.dtype))
+                array = pa.FixedSizeListArray.from_arrays(parts, 2)
+            else:
+                array = pa.array(values)
+            arrays.append(array)
+            fields.append(pa.field(key, array.type, metadata=metadata or None))
+        header = self.header
+        if not isinstance(header, str):
+            header = json.dumps(header, default=str)
+        schema = pa.schema(fields, metadata={"header": header})
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def to_shared_memory(self, owner=True):
+        """Move the data array into a new shared memory block
+
+        The data array is copied once into the block and the container then uses
+        the block. Another process rebuilds the container from the returned handle
+        with 'from_shared_memory' without copying the data.
+
+        Parameters
+        ----------
+            owner: bool
+                the container owns the block and frees it in 'release', otherwise
+                the container that attaches with owner=True takes over the block.
+                On Windows the block only lives while a process maps it.
+
+        Returns
+        -------
+            SharedHandle
+        """
+        data = np.asarray(self._data)
+        if data.dtype == object:
+            raise TypeError("ragged data arrays can't be shared")
+        self.release()
+        self._data, self._shm = _sharedarray(data.shape, data.dtype, track=owner)
+        self._shm_owner = owner
+        self._data[...] = data
+        self._item_cache.clear()
+        self._cache_size = 0
+        return SharedHandle(
+            self._shm,
+            data.dtype.str,
+            data.shape,
+            self._labels,
+            self.header,
+            type(self),
+        )
+
+    @classmethod
+    def from_shared_memory(cls, handle, owner=False):
+        """Attach to a container in shared memory
+
+        Parameters
+        ----------
+            handle: SharedHandle
+            owner: bool take over the block from the container that created it
+
+        Returns
+        -------
+            DataContainer of the class in the handle
+        """
+        data, _ = _sharedarray(handle.shape, handle.dtype, handle.name, owner)
+        container = handle.cls(data, handle.labels, header=handle.header)
+        container._shm = handle.name  # pylint: disable=protected-access
+        container._shm_owner = owner  # pylint: disable=protected-access
+        return container
+
+    def release(self):
+        """Release the shared memory block and free it if the container owns it
+
+        The container must not be used afterwards. The memory is returned to the
+        system once no array refers to the block anymore.
+        """
+        if self._shm is None:
+            return
+        if self._shm_owner:
+            _unlink(self._shm)
+        self._shm = None
+        self._data = None
+        self._item_cache.clear()
+        self._cache_size = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the data array is pickled as a copy, not the shared memory block
+        state.update(_shm=None, _shm_owner=False)
+        return state
 
     def __dir__(self):
         attrs = list(filter(lambda s: not s.startswith("_"), super().__dir__()))
@@ -4,6 +4,13 @@ Quadratic Interpolation of Spectral Peaks
 https://ccrma.stanford.edu/~jos/sasp/Quadratic_Interpolation_Spectral_Peaks.html
 """
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from toolbag.windows import get_window
+
+# measured cost of one bin of the direct DFT relative to one stage of the FFT,
+# below ZOOM_MIN_SAMPLES the fixed overhead of the direct DFT dominates
+ZOOM_COST = 1
+ZOOM_MIN_SAMPLES = 2**16
 
 
 def gaussianwindow(x, sigma=0.2):
@@ -13,21 +20,50 @@ def gaussianwindow(x, sigma=0.2):
     ----------
     sigma : float
     """
-    i = np.arange(len(x))
-    m = (len(x) - 1) / 2
-    return x * np.exp(-((i - m) ** 2) / (2 * (sigma * len(x)) ** 2))
+    return x * get_window(("gaussian", sigma), len(x)).values
 
 
-def extract_singletone(x, fs, approx_freq=None, search=0.05):
-    """Extract single tone from a time domain signal
+def _zoomspectrum(x, window, start, stop):
+    """Magnitude spectrum of bins start..stop-1 of 'x' windowed by 'window'
 
-    Finds the frequency and amplitude of the largest amplitude tone in the
-    time domain signal.
+    The bins are computed by direct DFT. Each record is split into blocks of
+    about sqrt(n_samples) samples and one matrix product correlates all blocks
+    with the phasors of the bins over one block. The block results are then
+    rotated by the phasor at the start of each block and summed.
+    """
+    n_samples = x.shape[-1]
+    block = int(np.ceil(np.sqrt(n_samples)))
+    n_blocks = -(-n_samples // block)
+    bins = np.arange(start, stop)
+    fine = np.multiply.outer(np.arange(block), bins) % n_samples
+    fine = np.exp(-2j * np.pi * fine / n_samples)
+    coarse = np.multiply.outer(np.arange(n_blocks) * block, bins) % n_samples
+    coarse = np.exp(-2j * np.pi * coarse / n_samples)
+    dtype = np.result_type(x, window, np.float64)
+    blocks = np.zeros(x.shape[:-1] + (n_blocks * block,), dtype=dtype)
+    np.multiply(x, window, out=blocks[..., :n_samples])
+    blocks = blocks.reshape(x.shape[:-1] + (n_blocks, block))
+    if np.iscomplexobj(blocks):
+        partial = blocks @ fine
+    else:
+        # real blocks times the [re, im] columns of the phasors
+        partial = (blocks @ fine.view(np.float64)).view(np.complex128)
+    return np.abs((partial * coarse).sum(axis=-2))
+
+
+def extract_singletones(x, fs, approx_freq=None, search=0.05, window="gaussian"):
+    """Extract single tone from each of many time domain records
+
+    Finds the frequency and amplitude of the largest amplitude tone in each record
+    along the last axis of 'x'. Real records use a real FFT. If the search range
+    around 'approx_freq' spans only a few bins, these bins are computed directly
+    instead. The quadratic interpolation of the peak is most accurate with the
+    default Gaussian window.
 
     Parameters
     ----------
     x : array-like
-        time domain signal
+        time domain records (records x samples)
     fs : float
         sample frequency
     approx_freq : float
@@ -35,32 +71,167 @@ def extract_singletone(x, fs, approx_freq=None, search=0.05):
         if None, find the maximum amplitude
     search : float
         search ± percentage around approx_freq if given
+    window : str or tuple
+        FFT window, see toolbag.windows.get_window
 
     Returns
     -------
-    single_tone : 2-tuple of float
-        estimated parameters of single tone (frequency, amplitude)
+    single_tones : 2-tuple of ndarray
+        estimated frequency and amplitude of the single tone of each record
     """
-    n_samples = len(x)
+    # pylint: disable=too-many-locals
+    x = np.asarray(x)
+    n_samples = x.shape[-1]
     mid = n_samples // 2
-    xw = gaussianwindow(x)
-    coherent_gain = gaussianwindow(np.ones(n_samples)).sum() / n_samples
-    spectrum = np.abs(np.fft.fft(xw)[:mid])
+    window, coherent_gain, _ = get_window(window, n_samples)
     fmin_bin = 0
     fmax_bin = mid
     if approx_freq is not None:
         fmin = approx_freq * (1 - search)
         fmax = approx_freq * (1 + search)
         df = fs / n_samples
-        fmin_bin = np.floor(fmin / df).astype(int)
-        fmin_bin = 0 if fmin_bin < 0 else fmin_bin
-        fmax_bin = np.ceil(fmax / df).astype(int) + 1
-        fmax_bin = n_samples if fmax_bin > mid else fmax_bin
-    tone_bin = fmin_bin + spectrum[fmin_bin:fmax_bin].argmax()
-    a = np.log10(spectrum[tone_bin - 1])
-    b = np.log10(spectrum[tone_bin])
-    g = np.log10(spectrum[tone_bin + 1])
+        fmin_bin = max(int(np.floor(fmin / df)), 0)
+        fmax_bin = min(int(np.ceil(fmax / df)) + 1, mid)
+    # bins of the search range and their neighbours
+    start = max(fmin_bin - 1, 0)
+    stop = fmax_bin + 1
+    if (
+        n_samples >= ZOOM_MIN_SAMPLES
+        and ZOOM_COST * (stop - start) <= np.log2(n_samples)
+    ):
+        spectrum = _zoomspectrum(x, window, start, stop)
+    elif np.iscomplexobj(x):
+        start = 0
+        spectrum = np.abs(np.fft.fft(x * window)[..., : mid + 1])
+    else:
+        start = 0
+        spectrum = np.abs(np.fft.rfft(x * window))
+    search_range = spectrum[..., fmin_bin - start : fmax_bin - start]
+    tone_bin = fmin_bin + search_range.argmax(axis=-1)
+    tone_bin = tone_bin[..., np.newaxis]
+    # the magnitude spectrum of a real signal is even, so bin -1 mirrors bin 1
+    a = np.log10(np.take_along_axis(spectrum, np.abs(tone_bin - 1) - start, axis=-1))
+    b = np.log10(np.take_along_axis(spectrum, tone_bin - start, axis=-1))
+    g = np.log10(np.take_along_axis(spectrum, tone_bin + 1 - start, axis=-1))
     p = (a - g) / (2 * (a - 2 * b + g))
     f_est = (tone_bin + p) * fs / n_samples
     amp_est = 10 ** ((b - (a - g) * p / 4) - np.log10(n_samples * coherent_gain / 2))
-    return (f_est, amp_est)
+    return (f_est[..., 0], amp_est[..., 0])
+
+
+def extract_singletone(x, fs, approx_freq=None, search=0.05, window="gaussian"):
+    """Extract single tone from a time domain signal
+
+    Finds the frequency and amplitude of the largest amplitude tone in the
+    time domain signal.
+
+    Parameters
+    ----------
+    x : array-like
+        time domain signal
+    fs : float
+        sample frequency
+    approx_freq : float
+        approximate frequency to search for
+        if None, find the maximum amplitude
+    search : float
+        search ± percentage around approx_freq if given
+    window : str or tuple
+        FFT window, see toolbag.windows.get_window
+
+    Returns
+    -------
+    single_tone : 2-tuple of float
+        estimated parameters of single tone (frequency, amplitude)
+    """
+    x = np.asarray(x)[np.newaxis]
+    f_est, amp_est = extract_singletones(x, fs, approx_freq, search, window)
+    return (f_est[0], amp_est[0])
+
+
+def track_singletone(
+    chunks,
+    fs,
+    frame,
+    hop=None,
+    approx_freq=None,
+    search=0.05,
+    window="gaussian",
+    batch=64,
+):
+    """Track the frequency and amplitude of a single tone over time
+
+    The signal is split into frames of 'frame' samples every 'hop' samples and the
+    tone of each frame is estimated as in extract_singletones. The samples that
+    overlap the next chunk are carried over, so memory use is independent of the
+    length of the signal.
+
+    Parameters
+    ----------
+    chunks : iterable of array-like
+        consecutive chunks of the time domain signal of any length
+    fs : float
+        sample frequency
+    frame : int
+        number of samples per frame
+    hop : int
+        number of samples between the starts of frames up to 'frame', defaults
+        to frame // 2
+    approx_freq : float
+        approximate frequency to search for
+        if None, find the maximum amplitude
+    search : float
+        search ± percentage around approx_freq if given
+    window : str or tuple
+        FFT window, see toolbag.windows.get_window
+    batch : int
+        maximum number of frames per FFT
+
+    Yields
+    ------
+    track : 3-tuple of ndarray
+        time of the center of each frame relative to the first sample, estimated
+        frequency and amplitude
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    hop = frame // 2 if hop is None else hop
+    if frame < 3 or not 0 < hop <= frame:
+        raise ValueError("invalid 'frame' or 'hop'")
+    carry = None
+    start = 0  # index of the first sample of carry
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        carry = chunk[:0] if carry is None else carry
+        size = len(carry) + len(chunk)
+        if size < frame:
+            carry = np.concatenate([carry, chunk])
+            continue
+        n_frames = (size - frame) // hop + 1
+        # only the frames that start in carry need it joined to the chunk, the
+        # others are windowed straight from the chunk
+        n_joined = min(-(-len(carry) // hop), n_frames)
+        parts = []
+        if n_joined:
+            joined = np.concatenate([carry, chunk[: frame - 1]])
+            parts.append((joined, 0, n_joined))
+        if n_joined < n_frames:
+            parts.append((chunk[n_joined * hop - len(carry) :], n_joined, n_frames))
+        for samples, first, last in parts:
+            frames = sliding_window_view(samples, frame)[::hop]
+            for i in range(first, last, batch):
+                f_est, amp_est = extract_singletones(
+                    frames[i - first : min(i + batch, last) - first],
+                    fs,
+                    approx_freq,
+                    search,
+                    window,
+                )
+                index = np.arange(i, i + len(f_est)) * hop + start
+                yield ((index + (frame - 1) / 2) / fs, f_est, amp_est)
+        consumed = n_frames * hop - len(carry)
+        if consumed < 0:
+            carry = np.concatenate([carry[n_frames * hop :], chunk])
+        else:
+            # copy to release the chunk
+            carry = chunk[consumed:].copy()
+        start += n_frames * hop
@@ -1,9 +1,12 @@
 """LabVIEW utilities."""
+import pathlib
 import re
+import time
 from datetime import datetime, timedelta, timezone
 import numpy as np
 from unyt import unyt_array
 from toolbag.common import Error, singleton, ArrayOrientation, DataLabel, DCBase
+from toolbag.cache import cached
 
 __all__ = ["ReadCSV", "convert_timestamp"]
 
@@ -18,57 +21,90 @@ SI_PREFIXES = "yzafpnum kMGTPEZY"
 P3 = f"[{SI_PREFIXES}]"
 NUMBER = f"^(?P<mantissa>{P1})(?P<exponent>{P2}|{P3})?$"
 
+# scale factor indexed by the code point of a LabVIEW SI prefix
+SI_SCALES = np.zeros(128)
+SI_SCALES[[ord(prefix) for prefix in SI_PREFIXES]] = [
+    10 ** (-24 + 3 * i) for i in range(len(SI_PREFIXES))
+]
+
+# symbols of the LabVIEW SI prefixes indexed by exponent / 3 + 8
+SI_SYMBOLS = np.array([prefix.strip() for prefix in SI_PREFIXES], dtype=object)
+# number of rows written per block by write_csv
+BLOCKROWS = 65536
+
+# state machine of the NUMBER grammar without SI prefix for _parseblock
+# character classes: digit, sign, '.', 'e' or 'E', end of string, other
+NUMBER_CLASSES = np.full(129, 5, dtype=np.uint8)
+NUMBER_CLASSES[[ord(c) for c in "0123456789"]] = 0
+NUMBER_CLASSES[[ord("+"), ord("-")]] = 1
+NUMBER_CLASSES[ord(".")] = 2
+NUMBER_CLASSES[[ord("e"), ord("E")]] = 3
+NUMBER_CLASSES[0] = 4
+# next state * 6 indexed by state * 6 + character class, the states are start,
+# sign, integer, '.', fraction, 'e', exponent sign, exponent and invalid
+NUMBER_TRANSITIONS = 6 * np.array(
+    [
+        [2, 1, 8, 8, 0, 8],
+        [2, 8, 8, 8, 1, 8],
+        [2, 8, 3, 5, 2, 8],
+        [4, 8, 8, 5, 3, 8],
+        [4, 8, 8, 5, 4, 8],
+        [8, 6, 8, 8, 5, 8],
+        [7, 8, 8, 8, 6, 8],
+        [7, 8, 8, 8, 7, 8],
+        [8, 8, 8, 8, 8, 8],
+    ],
+    dtype=np.uint8,
+).ravel()
+NUMBER_ACCEPT = 6 * np.array([2, 3, 4, 7], dtype=np.uint8)
+
 DATALABEL = r"^(?P<name>[\w]+)(\s+)?(?P<unit>\(.+\))?( - )?(?P<legend>[\w ]+)?$"
 VALIDIDENTIFIER = "^[a-zA-Z][a-zA-Z0-9_]*$"
+# LabVIEW's epoch 1904-01-01 in seconds before the Unix epoch
+LABVIEW_EPOCH = 2082844800
 
 
-@singleton
-class ReadCSV:
-    """Read text files containing comma-separted values (CSV).
-
-    This reader supports a number of scenarios from a single array with
-    no header or data label to 2D arrays with multi-line header and data labels. It will
-    automatically determine the orientation of a 2D array if data labels are present.
-
-    The optional header can span multiple lines with the only constranit that a line
-    can't start with numerical values such as '1,1,some text...'.
-
-    A data label describes one axis (row or column) of the data. The format is
-    '<name> (<unit>) - <legend>' where <unit> and <legend> are optional. Place the
-    unit expression in parentheses and indicate the presence of the legend with ' - '.
-
-    The array consists of real, floating point values with supported formats of
-    floating point, scientific and SI prefixes (e.g. 1.0p = 1.0E-12). The values
-    'NaN', 'Inf' and '-Inf' are also supported.
+def _parseblock(cells):
+    """Parse a 2D array of cell strings into a float array in bulk.
 
-    Note:
-        Complex numbers are not yet supported.
-
-    Parameters
-    ----------
-        file: file, string file name or pathlib.Path
-
-    Attributes
-    ----------
-        data: Numpy ndarray of numerical values in the file
-        header: string of header information at the top of the file if present
-        labels: list of DataLabel for data labels if present
-
-    Returns
-    -------
-        ndarray if no data labels are present. DataContainer if data labels are
-        present.
+    Empty cells are NaN and a trailing LabVIEW SI prefix scales the mantissa.
+    Returns None if a cell can't be converted so that the caller can fall back to
+    parsing one cell at a time.
     """
+    if cells.size == 0:
+        return None
+    cells = np.where(cells == "", "NaN", cells)
+    chars = cells.view("U1").reshape(cells.shape + (-1,))
+    last = np.char.str_len(cells)[..., np.newaxis] - 1
+    suffix = np.take_along_axis(chars, last, axis=-1)[..., 0]
+    mantissa_end = np.take_along_axis(chars, np.maximum(last - 1, 0), axis=-1)[..., 0]
+    # a number has either a scientific exponent or an SI prefix
+    exponents = np.count_nonzero((chars == "e") | (chars == "E"), axis=-1)
+    prefixed = (
+        np.isin(suffix, list(SI_PREFIXES.replace(" ", "")))
+        & (np.char.isdigit(mantissa_end) | (mantissa_end == "."))
+        & (exponents == (suffix == "E"))
+    )
+    rows, columns = np.nonzero(prefixed)
+    chars[rows, columns, last[rows, columns, 0]] = ""
+    # float() accepts more than the NUMBER grammar such as '1e5', '1_0' or 'inf'
+    state = np.zeros(cells.shape, dtype=np.uint8)
+    for codes in np.moveaxis(chars.view(np.uint32), -1, 0):
+        classes = NUMBER_CLASSES.take(np.minimum(codes, 128))
+        state = NUMBER_TRANSITIONS.take(state + classes)
+    valid = np.isin(state, NUMBER_ACCEPT) | np.isin(cells, ["NaN", "Inf", "-Inf"])
+    if not np.all(valid):
+        return None
+    try:
+        data = cells.astype(np.float64)
+    except ValueError:
+        return None
+    data[rows, columns] *= SI_SCALES[suffix[rows, columns].view(np.uint32)]
+    return data
 
-    def _initialize_attributes(self):
-        """Initialize attributes for subsequent calls."""
-        self._rawcsv = []
-        self._array_row_start = 0
-        self._array_column_start = 0
-        self._orientation = ArrayOrientation.UNKNOWN
-        self.header = []
-        self.labels = []
-        self.data = []
+
+class _CSVParser:
+    """Parse state of one call to read_csv"""
 
     def __init__(self):
         self._rawcsv = []
@@ -105,30 +141,51 @@ class ReadCSV:
         #    are optional.
         # 6. If data labels are present, read_csv returns DataContainer.
         self._array_row_start = 0
-        found_row_start = False
         self._array_column_start = 0
         for line in self._rawcsv:
-            if not found_row_start:
-                if re.match(NUMBER, line[-1]) is None:
-                    self._array_row_start += 1
-                    continue
-                found_row_start = True
-            if re.match(NUMBER, line[0]) is None:
-                self._array_column_start = 1
+            if re.match(NUMBER, line[-1]) is not None:
+                break
+            self._array_row_start += 1
+        block = self._rawcsv[self._array_row_start :]
+        self.data = None
+        try:
+            cells = np.asarray(block, dtype=str)
+        except ValueError:
+            # ragged array
+            pass
+        else:
+            if cells.ndim == 2 and cells.size > 0:
+                # an empty or non-numeric first column holds the data labels
+                if not np.any(cells[:, 0] == ""):
+                    self.data = _parseblock(cells)
+                if self.data is None:
+                    self.data = _parseblock(cells[:, 1:])
+                    self._array_column_start = int(self.data is not None)
+        if self.data is None:
+            for line in block:
+                if re.match(NUMBER, line[0]) is None:
+                    self._array_column_start = 1
+                    break
+            block = [line[self._array_column_start :] for line in block]
+            self.data = self._parsecells(block)
+
+    def _parsecells(self, block):
+        """Parse the data array one cell at a time"""
+        data = []
+        for line in block:
             row = []
-            for column in line[self._array_column_start :]:
+            for column in line:
                 if column == "":
                     column = "NaN"
                 match = re.match(NUMBER, column)
                 if match is None:
                     raise Error(f"Non numeric value '{column}' found in data array")
                 row.append(self._parsenumber(*match.groups()))
-            self.data.append(row)
+            data.append(row)
         # numpy deprecated ragged array creation for dtype other than 'object'
-        if all([len(self.data[0]) == len(row) for row in self.data]):
-            self.data = np.asarray(self.data)
-        else:
-            self.data = np.asarray(self.data, dtype=object)
+        if all([len(data[0]) == len(row) for row in data]):
+            return np.asarray(data)
+        return np.asarray(data, dtype=object)
 
     def _parselabels(self, labels):
         """Parse labels"""
@@ -163,8 +220,15 @@ class ReadCSV:
                 self._parselabels(labels)
         self.header = "\n".join(map(",".join, self.header))
 
-    def __call__(self, file):
-        self._initialize_attributes()
+    def _restore(self, data, meta):
+        """Restore the parse state from the parse cache"""
+        self.data = data
+        self.header = meta["header"]
+        self.labels = meta["labels"]
+
+    @cached
+    def parse(self, file):
+        """Parse the CSV file"""
         try:
             for line in file.readlines():
                 self._rawcsv.append(line.strip().split(","))
@@ -180,9 +244,165 @@ class ReadCSV:
                 self.data = self.data.reshape((self.data.size,))
             return self.data
         if self._orientation == ArrayOrientation.COLUMN:
-            self.data = self.data.T
+            # store each column contiguously
+            self.data = np.ascontiguousarray(self.data.T)
         return DataContainer(self.data, self.labels, header=self.header)
 
+    def _makechunk(self, block, whole=False):
+        """Parse a block of data lines into the next chunk
+
+        'whole' is True if the block is the entire array of the file.
+        """
+        start = self._array_column_start
+        data = None
+        try:
+            cells = np.asarray(block, dtype=str)
+        except ValueError:
+            # ragged array
+            pass
+        else:
+            if cells.ndim == 2:
+                data = _parseblock(cells[:, start:])
+        if data is None:
+            data = self._parsecells([line[start:] for line in block])
+        if self._orientation == ArrayOrientation.ROW:
+            self.labels = []
+            self._parselabels([line[0] for line in block])
+            return DataContainer(data, self.labels, header=self.header)
+        if self._orientation == ArrayOrientation.COLUMN:
+            data = np.ascontiguousarray(data.T)
+            return DataContainer(data, self.labels, header=self.header)
+        # a single row or column is 1D like in parse, a single row only if it's
+        # the entire array so that all chunks of a 2D array are 2D
+        if data.ndim == 2 and (data.shape[1] == 1 or (whole and data.shape[0] == 1)):
+            data = data.reshape((data.size,))
+        return data
+
+    def iterchunks(self, file, rows):
+        """Parse the CSV file in blocks of rows"""
+        lines = (line.strip().split(",") for line in file)
+        for line in lines:
+            if re.match(NUMBER, line[-1]) is not None:
+                break
+            self.header.append(line)
+        else:
+            self.header = "\n".join(map(",".join, self.header))
+            return
+        self._array_row_start = len(self.header)
+        if re.match(NUMBER, line[0]) is None:
+            self._array_column_start = 1
+            self._orientation = ArrayOrientation.ROW
+        elif len(self.header) > 0 and len(self.header[-1]) == len(line):
+            self._orientation = ArrayOrientation.COLUMN
+            self._parselabels(self.header.pop())
+        self.header = "\n".join(map(",".join, self.header))
+        block = [line]
+        whole = True
+        for line in lines:
+            if len(block) == rows:
+                yield self._makechunk(block)
+                block = []
+                whole = False
+            block.append(line)
+        yield self._makechunk(block, whole)
+
+
+@singleton
+class ReadCSV:
+    """Read text files containing comma-separted values (CSV).
+
+    This reader supports a number of scenarios from a single array with
+    no header or data label to 2D arrays with multi-line header and data labels. It will
+    automatically determine the orientation of a 2D array if data labels are present.
+
+    The optional header can span multiple lines with the only constranit that a line
+    can't start with numerical values such as '1,1,some text...'.
+
+    A data label describes one axis (row or column) of the data. The format is
+    '<name> (<unit>) - <legend>' where <unit> and <legend> are optional. Place the
+    unit expression in parentheses and indicate the presence of the legend with ' - '.
+
+    The array consists of real, floating point values with supported formats of
+    floating point, scientific and SI prefixes (e.g. 1.0p = 1.0E-12). The values
+    'NaN', 'Inf' and '-Inf' are also supported.
+
+    Note:
+        Complex numbers are not yet supported.
+
+    Parameters
+    ----------
+        file: file, string file name or pathlib.Path
+
+    Attributes
+    ----------
+        data: Numpy ndarray of numerical values in the file
+        header: string of header information at the top of the file if present
+        labels: list of DataLabel for data labels if present
+
+    Returns
+    -------
+        ndarray if no data labels are present. DataContainer if data labels are
+        present.
+    """
+
+    def __init__(self):
+        self._last = _CSVParser()
+
+    @property
+    def data(self):
+        """Numerical values of the last file read"""
+        return self._last.data
+
+    @property
+    def header(self):
+        """Header of the last file read"""
+        return self._last.header
+
+    @property
+    def labels(self):
+        """Data labels of the last file read"""
+        return self._last.labels
+
+    def __call__(self, file):
+        parser = _CSVParser()
+        result = parser.parse(file)
+        self._last = parser
+        return result
+
+    def _iterchunks(self, file, rows):
+        parser = _CSVParser()
+        self._last = parser
+        yield from parser.iterchunks(file, rows)
+
+    def iter_chunks(self, file, rows=65536):
+        """Iterate over the data array of a CSV file in blocks of rows.
+
+        The header and data labels are parsed once and the data array is then read
+        and parsed 'rows' lines at a time, which allows reducing files that are
+        larger than memory. The orientation is determined from the first line of
+        the data array.
+
+        Parameters
+        ----------
+            file: file, string file name or pathlib.Path
+            rows: int number of lines in each block
+
+        Yields
+        ------
+            ndarray if no data labels are present. DataContainer if data labels are
+            present. For a row oriented array, each DataContainer holds the next
+            'rows' data labels.
+        """
+        if rows < 1:
+            raise ValueError(f"invalid number of rows '{rows}'")
+        try:
+            lines = iter(file.readline, "")
+        except AttributeError:
+            with open(file, "rt", encoding="utf-8-sig") as f:
+                yield from self._iterchunks(f, rows)
+        else:
+            yield from self._iterchunks(lines, rows)
+
     def __dir__(self):
         return list(filter(lambda s: not s.startswith("_"), super().__dir__()))
 
@@ -222,39 +442,9 @@ class DataContainer(DCBase):
                     self._valid_identifiers.append(f'["{axis.name}"]')
             self.legends.append(axis.legend)
 
-    def __getitem__(self, item):
-        try:
-            return self._item_cache[item]
-        except KeyError:
-            labels = [axis.label for axis in self._labels]
-            names = [axis.name for axis in self._labels]
-            units = [axis.unit for axis in self._labels]
-            if isinstance(item, int):
-                self._item_cache[item] = unyt_array(
-                    self._data[item], units[item], name=names[item]
-                )
-            elif isinstance(item, str):
-                try:
-                    i = names.index(item)
-                except ValueError:
-                    try:
-                        i = labels.index(item)
-                    except ValueError:
-                        raise KeyError(f"{item}") from None
-                self._item_cache[item] = unyt_array(
-                    self._data[i], units[i], name=names[i]
-                )
-            else:
-                raise KeyError(f"{item}") from None
-            return self._item_cache[item]
-        except TypeError:
-            if isinstance(item, slice):
-                rows = self._data.shape[0]
-                start = item.start if item.start is not None else 0
-                stop = item.stop if item.stop is not None else rows
-                step = item.step if item.step is not None else 1
-                return [self[i] for i in range(start, stop, step)]
-            raise KeyError(f"{item}") from None
+    def _makeitem(self, i):
+        axis = self._labels[i]
+        return unyt_array(self._data[i], axis.unit, name=axis.name)
 
     @property
     def columns(self):
@@ -262,57 +452,364 @@ class DataContainer(DCBase):
         return [dl.label for dl in self._labels]
 
 
-def convert_timestamp(timestamp):
+def _utcoffset(seconds):
+    """UTC offset in seconds of the local time zone at 'seconds' since 1970"""
+    dt = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds)
+    return int(dt.astimezone().utcoffset().total_seconds())
+
+
+def _localoffsets(start, stop):
+    """Transitions and UTC offsets of the local time zone from 'start' to 'stop'
+
+    The offset is sampled once per day and a change is located to the second by
+    bisection, which assumes at most one transition per day.
+
+    Returns
+    -------
+        (transitions, offsets) as lists of int seconds since 1970
+    """
+    transitions = [start]
+    offsets = [_utcoffset(start)]
+    previous = start
+    for day in range(start + 86400, stop + 86400, 86400):
+        day = min(day, stop)
+        if (offset := _utcoffset(day)) != offsets[-1]:
+            low, high = previous, day
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _utcoffset(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high)
+            offsets.append(offset)
+        previous = day
+    return transitions, offsets
+
+
+def convert_timestamp(timestamp, utc=False):
     """Convert LabVIEW's timestamp to datetime.
 
     Parameters
     ----------
         timestamp: float seconds in LabVIEWS's epoch and UTC.
             Also supports ndarray of timestamps.
+        utc: bool
+            if True, keep the date and time in UTC
 
     Returns
     -------
         date and time in machine's local time zone and time zone naive
-        datetime if timestamp is scalar or ndarray of np.datetime64 if array
+        datetime if timestamp is scalar or ndarray of np.datetime64[ns] if array
+        where NaN timestamps are NaT
     """
     # LabVIEW's timestamp is UTC
     def _convert(ts):
         dt = datetime(1904, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=ts)
+        if utc:
+            return dt.replace(tzinfo=None)
         return dt.astimezone().replace(tzinfo=None)
 
-    if isinstance(timestamp, np.ndarray):
-        return np.vectorize(_convert, otypes=[np.datetime64])(timestamp)
-    return _convert(timestamp)
+    if not isinstance(timestamp, np.ndarray):
+        return _convert(timestamp)
+    timestamp = np.asarray(timestamp, dtype=np.float64)
+    invalid = ~np.isfinite(timestamp)
+    hasinvalid = invalid.any()
+    if hasinvalid:
+        timestamp = np.where(invalid, 0.0, timestamp)
+    # whole seconds and the fraction separately to keep nanoseconds resolution
+    fraction, seconds = np.modf(timestamp)
+    fraction *= 1e9
+    ns = seconds.astype(np.int64)
+    ns -= LABVIEW_EPOCH
+    ns *= 1_000_000_000
+    ns += np.rint(fraction, out=fraction).astype(np.int64)
+    if not utc and ns.size > invalid.sum():
+        valid = ns[~invalid] if hasinvalid else ns
+        start = int(valid.min() // 1_000_000_000)
+        stop = int(valid.max() // 1_000_000_000) + 1
+        transitions, offsets = _localoffsets(start, stop)
+        if len(offsets) == 1:
+            ns += offsets[0] * 1_000_000_000
+        else:
+            transitions = np.asarray(transitions[1:], dtype=np.int64) * 1_000_000_000
+            i = np.searchsorted(transitions, ns, side="right")
+            ns += np.asarray(offsets, dtype=np.int64)[i] * 1_000_000_000
+    result = ns.view("datetime64[ns]")
+    if hasinvalid:
+        result[invalid] = np.datetime64("NaT")
+    return result
+
+
+def _formatblock(block, float_format, si):
+    """Format a 2D numeric array as CSV lines"""
+    # pylint: disable=no-member
+    rows, columns = block.shape
+    if si:
+        # the mantissa is rounded to the precision of the data, which drops the
+        # noise of scaling by the prefix
+        precision = np.finfo(block.dtype).precision if block.dtype.kind == "f" else 15
+        block = block.astype(np.float64)
+    if float_format is None:
+        float_format = "%d" if block.dtype.kind in "biu" else "%r"
+    if si:
+        finite = np.isfinite(block) & (block != 0)
+        magnitude = np.zeros(block.shape, dtype=int)
+        magnitude[finite] = np.floor(np.log10(np.abs(block[finite])))
+        exponent = magnitude // 3
+        # beyond yocto and yotta a number is written without a prefix
+        scaled = finite & (np.abs(exponent) <= 8)
+        exponent[~scaled] = 0
+        mantissa = block / 1000.0**exponent
+        scale = 10.0 ** (precision - 1 - (magnitude - 3 * exponent)[scaled])
+        mantissa[scaled] = np.round(mantissa[scaled] * scale) / scale
+        values = np.empty((rows, 2 * columns), dtype=object)
+        values[:, ::2] = mantissa
+        values[:, 1::2] = SI_SYMBOLS[exponent + 8]
+        float_format += "%s"
+    elif float_format == "%r" and block.dtype.kind == "f" and block.dtype != np.float64:
+        # the shortest repr at the precision of the data, the float64 of tolist()
+        # would write 0.1 in float32 as 0.10000000149011612
+        values = block.astype(str)
+        float_format = "%s"
+    else:
+        values = block
+    line = ",".join([float_format] * columns) + "\n"
+    text = (line * rows) % tuple(values.ravel().tolist())
+    if block.dtype.kind == "f":
+        text = text.replace("nan", "NaN").replace("inf", "Inf")
+    return text
 
 
-def write_csv(file, data, header=None, mode="w"):
+def write_csv(file, data, header=None, mode="w", float_format=None, si=False):
     """Write data to text file in CSV format
 
+    Numeric arrays are written row by row in blocks. A DataContainer is written as
+    columns below its header and a row of its data labels. A complex column is
+    written as the two columns '<label>.real' and '<label>.imag'.
+
     Parameters
     ----------
     file : str or Path-like
-    data : array-like
+    data : array-like or DataContainer
+        rows of str or a numeric array
     header : str
+        defaults to the header of a DataContainer
     mode : str
         applicable when 'file' is a str
         'w' overwrite existing
         'a' append
+    float_format : str
+        printf-style format of a number such as '%.6g', defaults to the shortest
+        representation that reads back exactly
+    si : bool
+        write numbers in LabVIEW's SI notation such as '1.5k'
     """
+    # pylint: disable=too-many-arguments
     try:
         file = open(file, mode + "t")
     except TypeError:
         pass
+    labels = None
+    if isinstance(data, DCBase):
+        # pylint: disable=protected-access
+        columns = data._exportcolumns()
+        labels = [key for key, _, _ in columns]
+        # the header of an LTSpice text file is its line of data labels and the
+        # header of a raw file is a dict
+        original = "\t".join(axis.label for axis in data._labels)
+        if header is None and isinstance(data.header, str):
+            if data.header and data.header != original:
+                header = data.header
+        data = []
+        for key, values, _ in columns:
+            if np.iscomplexobj(values):
+                i = labels.index(key)
+                labels[i : i + 1] = [key + ".real", key + ".imag"]
+                data.extend([values.real, values.imag])
+            else:
+                data.append(values)
+        data = np.column_stack(data)
     if header is not None:
         file.write(header + "\n")
-    for row in data:
-        if isinstance(row, np.ndarray):
-            row = ",".join(row.astype(str))
-        else:
-            row = ",".join(row)
-        file.write(row + "\n")
+    if labels is not None:
+        file.write(",".join(labels) + "\n")
+    if isinstance(data, np.ndarray) and data.dtype.kind in "biuf":
+        data = data.reshape((-1, data.shape[-1])) if data.ndim != 1 else data[None]
+        for i in range(0, len(data), BLOCKROWS):
+            file.write(_formatblock(data[i : i + BLOCKROWS], float_format, si))
+    else:
+        for row in data:
+            if isinstance(row, np.ndarray):
+                row = ",".join(row.astype(str))
+            else:
+                row = ",".join(row)
+            file.write(row + "\n")
     file.close()
 
 
+class CSVAppender:
+    """Append rows of numbers to a CSV file that stays open
+
+    Rows are buffered and written in the format of write_csv when the buffer is
+    full, when the oldest buffered row is older than 'flush_interval' at the next
+    append or on flush() and close(). Only whole lines are written, so the file is
+    readable by read_csv after every flush. With 'max_bytes', the rows continue in
+    '<stem>.1<suffix>', '<stem>.2<suffix>', ... once a file exceeds the size and
+    every file starts with the header and labels. Rotation never overwrites an
+    existing file; it continues after the highest existing index.
+
+    Parameters
+    ----------
+    file : str or Path-like
+    columns : int
+        number of values per row
+    header : str
+    labels : list of str
+        data labels of the columns such as 'Time (s)'
+    mode : str
+        'w' overwrite existing and, with 'max_bytes', remove its rotated files
+        'a' append to the last rotated file if any
+    buffer_rows : int
+    flush_interval : float
+        seconds
+    max_bytes : int
+        rotate to a new file once the size is exceeded
+    float_format : str
+        see write_csv
+    si : bool
+        see write_csv
+
+    Examples
+    --------
+    >>> with CSVAppender("log.csv", 2, labels=["Time (s)", "Voltage (V)"]) as log:
+    ...     log.append([0.0, 1.2])
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        file,
+        columns,
+        header=None,
+        labels=None,
+        mode="a",
+        buffer_rows=4096,
+        flush_interval=1.0,
+        max_bytes=None,
+        float_format=None,
+        si=False,
+    ):  # pylint: disable=too-many-arguments
+        if labels is not None and len(labels) != columns:
+            raise ValueError("number of labels doesn't match 'columns'")
+        self._path = pathlib.Path(file)
+        self._header = header
+        self._labels = labels
+        self._buffer = np.empty((buffer_rows, columns))
+        self._count = 0
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._format = (float_format, si)
+        self._oldest = 0.0
+        self.files = []
+        self._file = None
+        indices = self._rotated()
+        if mode == "a" and indices:
+            self._open(self._rotatedpath(indices[-1]), mode)
+        else:
+            if mode == "w" and max_bytes is not None:
+                # start a new set of files
+                for index in indices:
+                    self._rotatedpath(index).unlink()
+            self._open(self._path, mode)
+
+    def _rotatedpath(self, index):
+        return self._path.with_name(f"{self._path.stem}.{index}{self._path.suffix}")
+
+    def _rotated(self):
+        """Sorted indices of the existing rotated files"""
+        pattern = re.compile(
+            rf"{re.escape(self._path.stem)}\.([0-9]+){re.escape(self._path.suffix)}"
+        )
+        matches = [pattern.fullmatch(p.name) for p in self._path.parent.iterdir()]
+        return sorted(int(m.group(1)) for m in matches if m is not None)
+
+    def _open(self, path, mode):
+        self._file = open(path, mode + "t", encoding="utf-8")
+        self.files.append(path)
+        if self._file.tell() == 0:
+            if self._header is not None:
+                self._file.write(self._header + "\n")
+            if self._labels is not None:
+                self._file.write(",".join(self._labels) + "\n")
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        index = max(self._rotated(), default=0) + 1
+        self._open(self._rotatedpath(index), "x")
+
+    def append(self, rows):
+        """Append one row or a 2D array of rows"""
+        if self._file is None:
+            raise ValueError("I/O operation on closed CSVAppender")
+        rows = np.asarray(rows, dtype=np.float64)
+        rows = rows.reshape((-1, self._buffer.shape[1])) if rows.ndim < 2 else rows
+        if rows.shape[1] != self._buffer.shape[1]:
+            raise ValueError(f"rows must have {self._buffer.shape[1]} columns")
+        while len(rows) > 0:
+            if self._count == 0:
+                self._oldest = time.monotonic()
+            n = min(len(rows), len(self._buffer) - self._count)
+            self._buffer[self._count : self._count + n] = rows[:n]
+            self._count += n
+            rows = rows[n:]
+            if self._count == len(self._buffer):
+                self.flush()
+        if self._count and time.monotonic() - self._oldest >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows to the file"""
+        if self._count > 0:
+            if self._max_bytes is not None and self._file.tell() >= self._max_bytes:
+                self._rotate()
+            self._file.write(_formatblock(self._buffer[: self._count], *self._format))
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"<CSVAppender '{self._path}'>"
+
+
+def _threshold(array, threshold, start_index):
+    # The first element at or above the threshold from start index is found by
+    # binary search in the running maximum, which is non-descending.
+    running_max = np.fmax.accumulate(array[start_index:])
+    j = np.searchsorted(running_max, threshold, side="left")
+    upper = np.minimum(j, running_max.size - 1) + start_index
+    lower = np.maximum(upper - 1, start_index)
+    lower_y, upper_y = array[lower], array[upper]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = lower + (threshold - lower_y) / (upper_y - lower_y)
+    x = np.where(upper_y == threshold, upper, x)
+    x = np.where(j == 0, start_index, x)
+    return np.where(j == running_max.size, array.size - 1, x)
+
+
 def threshold_1d(array, threshold, start_index=0):
     """Threshold 1D array
 
@@ -325,25 +822,23 @@ def threshold_1d(array, threshold, start_index=0):
     Parameters
     ----------
     array : array-like
-    threshold : float
+        1D array or 2D array of rows
+    threshold : float or array-like
+        thresholds to find in the array or in each row
+    start_index : int
 
     Returns
     -------
-    x : float
+    x : float or ndarray
+        fractional index of each threshold
     """
-    array = np.asarray(array)
-    if threshold < array[start_index]:
-        x = start_index
-    elif threshold > array.max():
-        x = array.size - 1
-    elif threshold in array:
-        x = np.nonzero(threshold == array)[0][0]
-    else:
-        upper_index = np.nonzero(threshold < array)[0][0]
-        lower_index = upper_index - 1
-        lower_y, upper_y = array[lower_index : upper_index + 1]
-        x = lower_index + (threshold - lower_y) / (upper_y - lower_y)
-    return x
+    array = np.asarray(array, dtype=np.float64)
+    threshold = np.asarray(threshold, dtype=np.float64)
+    if array.ndim == 1:
+        return _threshold(array, threshold, start_index)[()]
+    # one threshold or row of thresholds per row
+    threshold = np.broadcast_to(threshold, array.shape[:1] + threshold.shape[1:])
+    return np.stack([_threshold(*args, start_index) for args in zip(array, threshold)])
 
 
 def interpolate_1d(array, x):
@@ -355,20 +850,27 @@ def interpolate_1d(array, x):
     Parameters
     ----------
     array : array-like
-    x : float
+        1D array or 2D array of rows
+    x : float or array-like
+        fractional indices into the array or into each row
 
     Returns
     -------
-    y : float
+    y : float or ndarray
     """
     array = np.asarray(array)
-    if x <= 0:
-        y = array[0]
-    elif x >= array.size - 1:
-        y = array[-1]
+    x = np.asarray(x, dtype=np.float64)
+    perrow = array.ndim == 2 and x.ndim < 2
+    if perrow:
+        # one index per row
+        x = np.broadcast_to(x, array.shape[:1])[:, np.newaxis]
+    x = np.clip(x, 0, array.shape[-1] - 1)
+    lower = np.floor(x).astype(int)
+    upper = np.minimum(lower + 1, array.shape[-1] - 1)
+    if array.ndim == 1:
+        y_lower, y_upper = array[lower], array[upper]
     else:
-        x_fractional, x_lower = np.modf(x)
-        x_lower = int(x_lower)
-        y_lower, y_upper = array[x_lower : x_lower + 2]
-        y = y_lower + x_fractional * (y_upper - y_lower)
-    return y
+        y_lower = np.take_along_axis(array, lower, axis=-1)
+        y_upper = np.take_along_axis(array, upper, axis=-1)
+    y = y_lower + (x - lower) * (y_upper - y_lower)
+    return y[:, 0] if perrow else y[()]
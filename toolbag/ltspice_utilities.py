@@ -1,12 +1,15 @@
 """LTSpice utilities"""
+import functools
+import io
+import mmap
 import re
 import pathlib
-import struct
 import dateutil
 import numpy as np
 from unyt import matplotlib_support, Unit, unyt_array
 from unyt.exceptions import UnitParseError
 from toolbag.common import singleton, VALIDIDENTIFIER, DataLabel, DCBase
+from toolbag.cache import cached
 
 __all__ = ["ReadLTxt"]
 
@@ -17,24 +20,26 @@ class Error(Exception):
     """General exception class for this module."""
 
 
+STEP = r"^\s*\.step\s+(.+)$"
+SPICENUMBER = r"^([+-]?[0-9]*\.?[0-9]+(?:[eE][+-]?[0-9]+)?)(meg|[fpnumkgt])?"
+SPICESCALES = {
+    "f": 1e-15,
+    "p": 1e-12,
+    "n": 1e-9,
+    "u": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "meg": 1e6,
+    "g": 1e9,
+    "t": 1e12,
+}
 ATOMICLABEL = r"time|Freq.|frequency|freq|omega|V\(\w+\)|I\(\w+\)"
 SIMPLE_EXPRESSION = r"^([VI])\(([\w]+)\)$"
+NUMBERDELIMITERS = str.maketrans("(),°\t", "     ")
 
 
-@singleton
-class ReadLTxt:
-    """Read LTSpice text files of trace data.
-
-    In LTSpice it is possible to export trace data by 'File -> Export data as text'.
-
-    Parameters
-    ----------
-        file: file, string file name or pathlib.Path
-
-    Returns
-    -------
-        DataContainer
-    """
+class _LTxtParser:
+    """Parse state of one call to read_ltxt"""
 
     def __init__(self):
         self._rawtxt = []
@@ -43,14 +48,6 @@ class ReadLTxt:
         self._traces = []
         self._data = []
 
-    def _initialize_attributes(self):
-        """Initialize attributes for subsequent calls."""
-        self._rawtxt = []
-        self._labels = []
-        self._units = []
-        self._traces = []
-        self._data = []
-
     @staticmethod
     def _parsenumber(value):
         ispolar = value.startswith("(")
@@ -100,36 +97,71 @@ class ReadLTxt:
                     DataLabel(updated_label, name, ["dB", "degree"], None)
                 )
 
-    def _makearray(self):
-        data = []
-        for line in self._rawtxt[1:]:
-            row = []
-            for column in line:
-                values = [float(v.strip("dB°")) for v in column.strip("()").split(",")]
-                row.append(complex(*values))
-            data.append(row)
-        self._data = np.asarray(data).T
-
-    def __call__(self, file):
-        self._initialize_attributes()
+    def _makearray(self, body):
+        # Complex values are '(<dB>dB,<deg>°)' or '<re>,<im>' and are split into two
+        # float columns so the whole table parses as one run of numbers.
+        body = body.replace("dB", " ").translate(NUMBERDELIMITERS)
+        n_columns = sum(
+            2 if isinstance(axis.unit, list) else 1 for axis in self._labels
+        )
+        body = body.strip()
+        n_rows = body.count("\n") + 1 if body else 0
+        try:
+            values = np.array(body.split(), dtype=np.float64)
+        except ValueError as exc:
+            raise Error("unable to parse the trace data") from exc
+        if values.size != n_rows * n_columns:
+            raise Error("unable to parse the trace data")
+        self._data = np.ascontiguousarray(values.reshape((n_rows, n_columns)).T)
+
+    @cached
+    def parse(self, file):
+        """Parse the text file"""
         try:
-            for line in file.readlines():
-                self._rawtxt.append(line.strip().split("\t"))
+            text = file.read()
         except AttributeError:
+            with open(file, "rb") as f:
+                text = f.read()
+        if isinstance(text, bytes):
             try:
-                f = open(file, "rt", encoding="utf-8")
-                for line in f.readlines():
-                    self._rawtxt.append(line.strip().split("\t"))
+                text = text.decode("utf-8")
             except UnicodeDecodeError:
-                f.close()
-                f = open(file, "rt", encoding="cp1252")
-                for line in f.readlines():
-                    self._rawtxt.append(line.strip().split("\t"))
-            f.close()
+                text = text.decode("cp1252")
+        header, _, body = text.partition("\n")
+        first = body.lstrip().partition("\n")[0]
+        self._rawtxt = [header.strip().split("\t"), first.strip().split("\t")]
         self._parseheader()
-        self._makearray()
+        self._makearray(body)
         return DataContainer(self._data, self._labels)
 
+
+def _parsespicenumber(value):
+    """Parse a SPICE number such as '4.7k' or '1meg' and keep it as str if not"""
+    if (match := re.match(SPICENUMBER, value, flags=re.IGNORECASE)) is None:
+        return value
+    mantissa, suffix = match.groups()
+    scale = 1.0 if suffix is None else SPICESCALES[suffix.lower()]
+    return float(mantissa) * scale
+
+
+@singleton
+class ReadLTxt:
+    """Read LTSpice text files of trace data.
+
+    In LTSpice it is possible to export trace data by 'File -> Export data as text'.
+
+    Parameters
+    ----------
+        file: file, string file name or pathlib.Path
+
+    Returns
+    -------
+        DataContainer
+    """
+
+    def __call__(self, file):
+        return _LTxtParser().parse(file)
+
     def __dir__(self):
         return list(filter(lambda s: not s.startswith("_"), super().__dir__()))
 
@@ -156,11 +188,16 @@ class DataContainer(DCBase):
         <name>: unyt_array
     """
 
+    _lookup_fields = ("label", "name")
+
     def _parselabels(self):
         labels = [axis.label for axis in self._labels]
         names = [axis.name for axis in self._labels]
         self.header = "\t".join(labels)
         self.legends = labels
+        # complex traces occupy two adjacent columns of the data array
+        widths = [2 if isinstance(axis.unit, list) else 1 for axis in self._labels]
+        self._columns = np.cumsum([0] + widths[:-1]).tolist()
         for name in filter(lambda n: n is not None, names):
             valid = re.match(VALIDIDENTIFIER, name) is not None
             if valid:
@@ -168,50 +205,132 @@ class DataContainer(DCBase):
             else:
                 self._valid_identifiers.append(f'["{name}"]')
 
+    def _makeitem(self, i):
+        axis = self._labels[i]
+        j = self._columns[i]
+        if not isinstance(axis.unit, list):
+            return unyt_array(self._data[j], axis.unit, name=axis.name)
+        return [
+            unyt_array(self._data[j], axis.unit[0], name=axis.name),
+            unyt_array(self._data[j + 1], axis.unit[1], name=axis.name),
+        ]
+
+    def _export(self, i):
+        axis = self._labels[i]
+        if not isinstance(axis.unit, list):
+            return super()._export(i)
+        parts = ["magnitude", "phase"] if axis.unit[0] == "dB" else ["real", "imag"]
+        return [
+            (f"{axis.label}.{part}", np.asarray(v), self._metadata(axis, v.units))
+            for part, v in zip(parts, self[i])
+        ]
+
+    def __len__(self):
+        return len(self._labels)
+
+
+class _RawData:
+    """Binary data block of a raw file decoded one variable at a time.
+
+    Parameters
+    ----------
+        buffer: bytes-like binary data block
+        info: dict of the raw file header
+    """
+
+    def __init__(self, buffer, info):
+        self._buffer = buffer
+        n = info["n_variables"]
+        n_points = info["n_points"]
+        self.shape = (n, n_points)
+        if "complex" in info["flags"]:
+            self.dtype = np.dtype(np.complex128)
+            formats = n * ["<c16"]
+        else:
+            self.dtype = np.dtype(np.float64)
+            var_fmt = "<f8" if "double" in info["flags"] else "<f4"
+            formats = ["<f8"] + (n - 1) * [var_fmt]
+        self._fastaccess = "fastaccess" in info["flags"]
+        if self._fastaccess:
+            # variable after variable
+            self._formats = [np.dtype(fmt) for fmt in formats]
+            sizes = [fmt.itemsize * n_points for fmt in self._formats]
+            self._offsets = np.cumsum([0] + sizes[:-1])
+        elif "complex" in info["flags"]:
+            self._point = np.dtype((formats[0], (n,)))
+        else:
+            self._point = np.dtype([("x", formats[0]), ("y", formats[1], (n - 1,))])
+
+    def _points(self):
+        return np.frombuffer(self._buffer, self._point, count=self.shape[1])
+
+    def _variable(self, i):
+        """View of variable i of a FastAccess file"""
+        fmt, offset = self._formats[i], self._offsets[i]
+        return np.frombuffer(self._buffer, fmt, count=self.shape[1], offset=offset)
+
+    def column(self, i):
+        """Decode variable i
+
+        Variables other than the x-axis of a FastAccess file are views of the buffer.
+        """
+        i = range(self.shape[0])[i]
+        if self._fastaccess:
+            values = self._variable(i)
+            if i > 0:
+                return values
+            values = values.copy()
+        elif self.dtype.kind == "c":
+            values = self._points()[:, i].copy()
+        elif i == 0:
+            values = self._points()["x"].copy()
+        else:
+            values = self._points()["y"][:, i - 1].astype(self.dtype)
+        if i == 0:
+            # fix LTSpice double sign mistake
+            np.abs(values.real, out=values.real)
+        return values
+
+    def array(self):
+        """Decode all variables"""
+        if self._fastaccess:
+            data = np.empty(self.shape, self.dtype)
+            for i in range(self.shape[0]):
+                data[i] = self._variable(i)
+            np.abs(data[0].real, out=data[0].real)
+            return data
+        points = self._points()
+        if self.dtype.kind == "c":
+            data = np.ascontiguousarray(points.T)
+        else:
+            data = np.empty(self.shape, self.dtype)
+            data[0] = points["x"]
+            data[1:] = points["y"].T
+        # fix LTSpice double sign mistake
+        np.abs(data[0].real, out=data[0].real)
+        return data
+
+    def __len__(self):
+        return self.shape[0]
+
     def __getitem__(self, item):
-        try:
-            return self._item_cache[item]
-        except KeyError:
-            if isinstance(item, int):
-                i = item
-                try:
-                    self._labels[i]
-                except IndexError:
-                    raise IndexError(f"{self._objstr} index out of range") from None
-            else:
-                labels = [axis.label for axis in self._labels]
-                names = [axis.name for axis in self._labels]
-                try:
-                    i = labels.index(item)
-                except ValueError:
-                    try:
-                        i = names.index(item)
-                    except ValueError:
-                        raise KeyError(f"{item}") from None
-            axis = self._labels[i]
-            if not isinstance(axis.unit, list):
-                self._item_cache[item] = unyt_array(
-                    self._data[i].real, axis.unit, name=axis.name
-                )
-            else:
-                self._item_cache[item] = [
-                    unyt_array(self._data[i].real, axis.unit[0], name=axis.name),
-                    unyt_array(self._data[i].imag, axis.unit[1], name=axis.name),
-                ]
-            return self._item_cache[item]
-        except TypeError:
-            if isinstance(item, slice):
-                rows = self._data.shape[0]
-                start = item.start if item.start is not None else 0
-                stop = item.stop if item.stop is not None else rows
-                step = item.step if item.step is not None else 1
-                return [self[i] for i in range(start, stop, step)]
-            raise KeyError(f"{item}") from None
+        return self.column(item)
 
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("decoding the raw data requires a copy")
+        data = self.array()
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __reduce__(self):
+        return (np.asarray, (self.array(),))
+
+    def __repr__(self):
+        return f"<raw data {self.shape[0]} variables x {self.shape[1]} points>"
 
-@singleton
-class ReadLTraw:
-    """Read LTSpice raw files"""
+
+class _LTrawParser:
+    """Parse state of one call to read_ltraw"""
 
     def __init__(self):
         self._raw = b""
@@ -219,16 +338,24 @@ class ReadLTraw:
         self._data = np.asarray([])
         self._labels = []
 
-    def _initialize_attributes(self):
-        self._raw = b""
-        self._info = {}
-        self._data = np.asarray([])
-        self._labels = []
+    def _findheader(self):
+        """Find the encoding, end and data format of the header"""
+        encoding = "utf-16-le" if self._raw[1:2] == b"\x00" else "latin-1"
+        limit = 2 ** 16
+        while True:
+            for fmt, last_line in [("binary", "Binary:\n"), ("ascii", "Values:\n")]:
+                last_line = last_line.encode(encoding)
+                end = self._raw.find(last_line, 0, limit)
+                if end >= 0:
+                    return encoding, end + len(last_line), fmt
+            if limit >= len(self._raw):
+                raise ValueError("'Binary:' or 'Values:' section not found")
+            limit *= 16
 
     def _parseheader(self):
-        encoding = "utf-16-le"
-        last_line = "Binary:\n".encode(encoding)
-        binary_start = self._raw.index(last_line) + len(last_line)
+        encoding, binary_start, fmt = self._findheader()
+        self._info["encoding"] = encoding
+        self._info["format"] = fmt
         self._info["binary_start"] = binary_start
         header = self._raw[:binary_start].decode(encoding)
         self._info["header"] = header
@@ -269,24 +396,62 @@ class ReadLTraw:
                     variables.append((v, t))
                 self._info["variables"] = variables
                 break
-            else:
-                k = line.split(":")[0]
-                raise ValueError(f"Unexpected header key '{k}'")
+            elif ":" in line:
+                k, v = line.split(":", maxsplit=1)
+                self._info[k] = v.strip()
 
-    def _makearray(self):
-        data = []
-        m, var_fmt = (2, "d") if "complex" in self._info["flags"] else (1, "f")
+    def _parsevalues(self):
+        """Parse the 'Values:' section of an ASCII raw file"""
         n = self._info["n_variables"]
-        buffer = self._raw[self._info["binary_start"] :]
-        # pylint: disable=no-member
-        for values in struct.iter_unpack("<" + m * "d" + m * (n - 1) * var_fmt, buffer):
-            # fix LTSpice double sign mistake
-            values = list(values)
-            values[0] = abs(values[0])
-            if m == 2:
-                values = [complex(r, i) for r, i in zip(values[0::2], values[1::2])]
-            data.append(values)
-        self._data = np.asarray(data).T
+        n_points = self._info["n_points"]
+        text = self._raw[self._info["binary_start"] :].decode(self._info["encoding"])
+        m = 1
+        if "complex" in self._info["flags"]:
+            m = 2
+            text = text.replace(",", " ")
+        size = n_points * (1 + m * n)
+        values = text.split(maxsplit=size)[:size]
+        if len(values) < size:
+            raise ValueError("'Values:' section has fewer values than expected")
+        try:
+            values = np.array(values, dtype=np.float64)
+        except ValueError as exc:
+            raise ValueError("'Values:' section has an invalid number") from exc
+        # each point is the point index followed by the values of the variables
+        values = values.reshape((n_points, 1 + m * n))
+        values = values[:, 1:]
+        if m == 2:
+            values = values[:, 0::2] + 1j * values[:, 1::2]
+        data = np.ascontiguousarray(values.T)
+        # fix LTSpice double sign mistake
+        np.abs(data[0].real, out=data[0].real)
+        return data
+
+    def _makearray(self):
+        if self._info["format"] == "ascii":
+            self._data = self._parsevalues()
+        else:
+            buffer = memoryview(self._raw)[self._info["binary_start"] :]
+            self._data = _RawData(buffer, self._info)
+
+    def _parsesteps(self, file):
+        """Parse the step parameters from the log file of a stepped simulation"""
+        if "stepped" not in self._info["flags"]:
+            return
+        try:
+            log = pathlib.Path(file).with_suffix(".log").read_bytes()
+        except (TypeError, OSError):
+            return
+        encoding = "utf-16-le" if b"\x00" in log[:2] else "cp1252"
+        steps = []
+        for line in log.decode(encoding, errors="replace").splitlines():
+            if (match := re.match(STEP, line)) is not None:
+                params = {}
+                for param in match.group(1).split():
+                    k, _, v = param.partition("=")
+                    params[k] = _parsespicenumber(v)
+                steps.append(params)
+        self._info["steps"] = steps
 
     @staticmethod
     def _makename(variable):
@@ -311,47 +476,202 @@ class ReadLTraw:
                 name = self._makename(v)
             self._labels.append(DataLabel(v, name, unit, v))
 
-    def __call__(self, file):
-        self._initialize_attributes()
+    @cached
+    def parse(self, file):
+        """Parse the raw file"""
         try:
             self._raw = file.read()
         except AttributeError:
             with open(file, "rb") as f:
                 self._raw = f.read()
         self._parseheader()
+        self._parsesteps(file)
+        self._makearray()
+        self._data = np.asarray(self._data)
+        self._makelabels()
+        return DataContainerRaw(self._data, self._labels, header=self._info)
+
+    @staticmethod
+    def _map(file):
+        """Memory map the raw file"""
+        try:
+            fileno = file.fileno()
+        except AttributeError:
+            with open(file, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except io.UnsupportedOperation:
+            return file.read()
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+    def parselazy(self, file):
+        """Parse the header of the raw file and decode variables on first access"""
+        self._raw = self._map(file)
+        self._parseheader()
+        self._parsesteps(file)
         self._makearray()
         self._makelabels()
         return DataContainerRaw(self._data, self._labels, header=self._info)
 
+
+@singleton
+class ReadLTraw:
+    """Read LTSpice raw files
+
+    Binary, FastAccess and ASCII raw files are supported. In lazy mode, a binary file
+    is memory mapped and only the header is parsed. A variable is decoded when it's
+    first accessed, which keeps opening large simulations fast and uses memory only
+    for the variables that are used. The variables of a FastAccess file are then
+    views of the memory mapped file.
+
+    Parameters
+    ----------
+        file: file, string file name or pathlib.Path
+        lazy: bool decode variables on first access
+
+    Returns
+    -------
+        DataContainerRaw
+    """
+
+    def __call__(self, file, lazy=False):
+        if lazy:
+            return _LTrawParser().parselazy(file)
+        return _LTrawParser().parse(file)
+
     def __dir__(self):
         return list(filter(lambda s: not s.startswith("_"), super().__dir__()))
 
     def __repr__(self):
-        return "<function toolbag.read_ltraw(file)>"
+        return "<function toolbag.read_ltraw(file, lazy=False)>"
+
+
+class _RunData:
+    """Variables of one run of a stepped simulation as views of the full traces"""
+
+    def __init__(self, container, start, stop):
+        self._container = container
+        self._start = start
+        self._stop = stop
+        self.shape = (len(container), stop - start)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, item):
+        # pylint: disable=protected-access
+        label = self._container._labels[item].label
+        return np.asarray(self._container[label])[self._start : self._stop]
+
+    def __array__(self, dtype=None, copy=None):
+        # pylint: disable=protected-access
+        data = self._container._data
+        if copy is False and not isinstance(data, np.ndarray):
+            raise ValueError("decoding the raw data requires a copy")
+        data = np.asarray(data)[:, self._start : self._stop]
+        return np.array(data, dtype=dtype, copy=copy)
+
+    def __repr__(self):
+        return f"<run data {self.shape[0]} variables x {self.shape[1]} points>"
+
+
+class Runs:
+    """Runs of a stepped simulation.
+
+    The run boundaries are where the x-axis returns to its start value. Indexing
+    returns a DataContainerRaw of one run that views the full traces without
+    copying.
+
+    Parameters
+    ----------
+        container: DataContainerRaw
+
+    Attributes
+    ----------
+        offsets: ndarray of start index of each run and the end of the last run
+        parameters: list of dict of step parameters from the log file if present
+    """
+
+    def __init__(self, container):
+        self._container = container
+        # pylint: disable=protected-access
+        info = container.header
+        x = np.asarray(container[container._labels[0].label])
+        if "stepped" in info.get("flags", []) and x.size > 0:
+            starts = np.flatnonzero(x == x[0])
+        else:
+            starts = np.zeros(1, dtype=np.intp)
+        self.offsets = np.append(starts, x.size)
+        self.parameters = info.get("steps")
+        if self.parameters is not None and len(self.parameters) != len(self):
+            self.parameters = None
+
+    @property
+    def lengths(self):
+        """ndarray of the number of points in each run"""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, item):
+        i = range(len(self))[item]
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        data = _RunData(self._container, start, stop)
+        header = dict(self._container.header, n_points=stop - start)
+        # pylint: disable=protected-access
+        return DataContainerRaw(data, self._container._labels, header=header)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def stack(self, variable):
+        """Stack the runs of a variable into a 2D array of shape (runs, points)
+
+        Parameters
+        ----------
+            variable: str
+
+        Returns
+        -------
+            unyt_array view of the full trace if all runs have the same length
+        """
+        lengths = self.lengths
+        if np.any(lengths != lengths[0]):
+            raise ValueError("runs have different lengths")
+        return self._container[variable].reshape((len(self), lengths[0]))
+
+    def __repr__(self):
+        return f"<Runs {len(self)} runs>"
 
 
 class DataContainerRaw(DCBase):
-    """DataContainer for LTSpice raw file"""
+    """DataContainer for LTSpice raw file
+
+    Attributes
+    ----------
+        header: dict of the raw file header
+        variables: list of variable names
+        runs: Runs of a stepped simulation
+    """
+
+    _lookup_fields = ("label",)
 
     def _parselabels(self):
         self._valid_identifiers = [axis.label for axis in self._labels]
 
+    @functools.cached_property
+    def runs(self):
+        """Runs of a stepped simulation"""
+        return Runs(self)
+
     @property
     def variables(self):
         """Return list of variables in the raw file"""
         return [axis.label for axis in self._labels]
 
-    def __getitem__(self, item):
-        try:
-            return self._item_cache[item]
-        except KeyError:
-            try:
-                i = [axis.label for axis in self._labels].index(item)
-            except ValueError:
-                raise KeyError(f"{item}") from None
-            axis = self._labels[i]
-            data = (
-                self._data[i].real if item in ["time", "frequency"] else self._data[i]
-            )
-            self._item_cache[item] = unyt_array(data, axis.unit, name=axis.name)
-        return self._item_cache[item]
+    def _makeitem(self, i):
+        axis = self._labels[i]
+        data = self._data[i]
+        if axis.label in ["time", "frequency"]:
+            data = np.ascontiguousarray(data.real)
+        return unyt_array(data, axis.unit, name=axis.name)
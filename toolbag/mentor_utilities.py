@@ -5,27 +5,13 @@ from toolbag.common import Error, singleton
 LINE_PATTERN = r"^(?P<level>[\.]{1,3})(?P<key>[\w]+) (?P<value>.+)$"
 
 
-@singleton
-class ReadPAF:
-    """Read Planes Assignments file (PAF).
-
-    Parameters
-    ----------
-        file: file, string file name or pathlib.Path
-
-    Returns
-    -------
-        PAFContainer
-    """
+class _PAFParser:
+    """Parse state of one call to read_paf"""
 
     def __init__(self):
         self._rawpaf = []
         self._paf = {}
 
-    def _initialize_attributes(self):
-        self._rawpaf = []
-        self._paf = {}
-
     def _parsepaf(self):
         current_key = None
         current_dict = {}
@@ -72,8 +58,8 @@ class ReadPAF:
                 current_key = up_key
                 current_dict = {}
 
-    def __call__(self, file):
-        self._initialize_attributes()
+    def parse(self, file):
+        """Parse the PAF file"""
         try:
             self._rawpaf = file.readlines()
         except AttributeError:
@@ -88,6 +74,23 @@ class ReadPAF:
             return match.groups()
         raise Error(f"'{line}' not recognized")
 
+
+@singleton
+class ReadPAF:
+    """Read Planes Assignments file (PAF).
+
+    Parameters
+    ----------
+        file: file, string file name or pathlib.Path
+
+    Returns
+    -------
+        PAFContainer
+    """
+
+    def __call__(self, file):
+        return _PAFParser().parse(file)
+
     def __repr__(self):
         return "<function toolbag.read_paf(file)>"
 
@@ -1,5 +1,7 @@
 """Matplotlib utilities"""
+import numpy as np
 import matplotlib.pyplot as plt
+from unyt import unyt_array
 
 
 def reset_plot(fig):
@@ -22,3 +24,95 @@ def reset_plot(fig):
     for a in ax:
         a.figure = fig
         fig.add_axes(a)
+
+
+# bins per pixel column of an envelope, more bins draw closer to every sample
+BINS_PER_PIXEL = 4
+
+
+def _envelope(x, y, xlim, bins, scale):
+    """Decimate the samples of 'y' within 'xlim' to its envelope in 'bins'
+
+    The bins are evenly spaced on the axis 'scale'. Each bin is reduced to its
+    first, minimum, maximum and last sample in this order, which draws the same
+    pixels as connecting every sample.
+    """
+    x0, x1 = min(xlim), max(xlim)
+    # one more sample either side to draw the line up to the edges of the axes
+    start = max(np.searchsorted(x, x0, side="left") - 1, 0)
+    stop = min(np.searchsorted(x, x1, side="right") + 1, x.size)
+    x, y = x[start:stop], y[start:stop]
+    if x.size <= 4 * bins or x1 <= x0:
+        return x, y
+    edges = np.linspace(*scale.transform([x0, x1]), bins + 1)
+    edges = scale.inverted().transform(edges)
+    starts = np.unique(np.append(0, np.searchsorted(x, edges[1:-1])))
+    starts = starts[starts < x.size]
+    ends = np.append(starts[1:], x.size) - 1
+    xs = np.stack([x[starts], x[starts], x[ends], x[ends]], axis=-1)
+    ys = np.stack(
+        [
+            y[starts],
+            np.fmin.reduceat(y, starts),
+            np.fmax.reduceat(y, starts),
+            y[ends],
+        ],
+        axis=-1,
+    )
+    return xs.ravel(), ys.ravel()
+
+
+def plot_envelope(ax, x, y, pixels=None, **kwargs):
+    """Plot a huge trace as its min/max envelope per pixel column
+
+    Only the envelope of the samples in each pixel column is sent to matplotlib,
+    which looks the same as plotting every sample but redraws much faster. The
+    envelope is recomputed from the full resolution data of the visible window
+    whenever the x-axis limits change such as by zooming or panning.
+
+    Parameters
+    ----------
+        ax : matplotlib axes
+        x : array-like
+            increasing x-axis such as time, unyt_array units are kept
+        y : array-like
+            trace of the same length as 'x'
+        pixels : int
+            number of pixel columns, defaults to the width of 'ax' in pixels
+        kwargs : passed to ax.plot
+
+    Returns
+    -------
+        matplotlib Line2D
+    """
+    x_units = getattr(x, "units", None)
+    y_units = getattr(y, "units", None)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be 1D arrays of the same length")
+
+    def _wrap(values, units):
+        return values if units is None else unyt_array(values, units)
+
+    def _decimate(xlim):
+        n = pixels or max(int(np.ceil(ax.bbox.width)), 1)
+        scale = ax.xaxis.get_transform()
+        xs, ys = _envelope(x, y, xlim, BINS_PER_PIXEL * n, scale)
+        return _wrap(xs, x_units), _wrap(ys, y_units)
+
+    (line,) = ax.plot(*_decimate((x[0], x[-1]) if x.size else (0, 0)), **kwargs)
+
+    def _update(ax):
+        if line.axes is None:
+            # the line was removed
+            ax.callbacks.disconnect(cid)
+            return
+        xlim = ax.get_xlim()
+        axis_units = getattr(ax.xaxis, "units", None)
+        if x_units is not None and axis_units is not None:
+            xlim = unyt_array(xlim, axis_units).to_value(x_units)
+        line.set_data(*_decimate(xlim))
+
+    cid = ax.callbacks.connect("xlim_changed", _update)
+    return line
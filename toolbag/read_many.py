@@ -0,0 +1,91 @@
+"""Read many files in parallel"""
+import concurrent.futures
+import os
+from toolbag.common import DCBase, SharedHandle
+from toolbag.labview_utilities import ReadCSV
+
+__all__ = ["read_many"]
+
+EXECUTORS = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+}
+
+
+def _read(reader, file):
+    return reader(file)
+
+
+def _readshared(reader, file):
+    result = reader(file)
+    if not isinstance(result, DCBase):
+        return result
+    try:
+        # the process that rebuilds the container takes over the block
+        return result.to_shared_memory(owner=False)
+    except TypeError:
+        return result
+
+
+def read_many(
+    files, reader=None, workers=None, executor="process", shared_memory=False
+):
+    """Read many files in parallel
+
+    The files are parsed in a pool of worker processes or threads. A failure to
+    read a file doesn't abort the batch; the exception is collected instead.
+
+    Note:
+        With the 'process' executor on platforms that spawn worker processes,
+        call read_many from within an 'if __name__ == "__main__":' block.
+
+    Parameters
+    ----------
+    files : iterable of str or path-like
+    reader : callable
+        reader such as read_csv, read_ltxt, read_ltraw or read_awr_tracedata
+        defaults to read_csv
+    workers : int
+        number of workers, defaults to the number of CPUs
+    executor : str
+        'process' or 'thread'
+    shared_memory : bool
+        return DataContainers of the 'process' executor in shared memory instead
+        of pickling their data, the caller owns the blocks and calls release() on
+        each container to free its block, not supported on Windows
+
+    Returns
+    -------
+    results : list
+        parsed content in the order of 'files' and None for a file that failed
+    errors : dict
+        exception raised for each file that failed
+    """
+    if reader is None:
+        reader = ReadCSV()
+    try:
+        pool = EXECUTORS[executor]
+    except KeyError:
+        raise ValueError(f"invalid executor '{executor}'") from None
+    shared_memory = shared_memory and executor == "process"
+    if shared_memory and os.name == "nt":
+        # Windows frees a block with its last mapping, which is the worker's
+        # mapping once it has returned the handle
+        raise ValueError("shared_memory isn't supported on Windows")
+    files = list(files)
+    workers = os.cpu_count() if workers is None else workers
+    read = _readshared if shared_memory else _read
+    with pool(max_workers=max(1, min(workers, len(files)))) as ex:
+        futures = [ex.submit(read, reader, file) for file in files]
+    results = []
+    errors = {}
+    for file, future in zip(files, futures):
+        try:
+            result = future.result()
+            if isinstance(result, SharedHandle):
+                result = DCBase.from_shared_memory(result, owner=True)
+            results.append(result)
+        except Exception as exc:  # pylint: disable=broad-except
+            results.append(None)
+            errors[file] = exc
+    return results, errors
@@ -0,0 +1,174 @@
+"""Waveform utilities
+
+Crossings and edge measurements of sampled waveforms such as LTSpice transients.
+"""
+from collections import namedtuple
+import numpy as np
+
+__all__ = ["find_crossings", "measure_edges", "EdgeMeasurements"]
+
+EdgeMeasurements = namedtuple(
+    "EdgeMeasurements",
+    [
+        "rising",
+        "falling",
+        "period",
+        "frequency",
+        "duty_cycle",
+        "rise_time",
+        "fall_time",
+    ],
+)
+EdgeMeasurements.__doc__ = """Edge measurements of a waveform
+
+Attributes
+----------
+    rising: ndarray rising crossings of the mid level
+    falling: ndarray falling crossings of the mid level
+    period: ndarray time between consecutive rising crossings
+    frequency: ndarray 1 / period
+    duty_cycle: ndarray fraction of each period above the mid level
+    rise_time: ndarray low to high level time of each rising edge
+    fall_time: ndarray high to low level time of each falling edge
+"""
+
+
+def _value(quantity, units):
+    """Value of 'quantity' in 'units' if both have units"""
+    if hasattr(quantity, "units") and units is not None:
+        return quantity.to_value(units)
+    return np.asarray(quantity, dtype=np.float64)
+
+
+def _crossings(y, level, hysteresis):
+    # A Schmitt trigger with the thresholds level ± hysteresis / 2 changes state
+    # at the first sample beyond the opposite threshold. The crossing is the last
+    # crossing of level before that sample.
+    above = y >= level
+    crossing = np.flatnonzero(above[1:] != above[:-1])
+    upper = y >= level + hysteresis / 2
+    mark = np.subtract(upper, y <= level - hysteresis / 2, dtype=np.int8)
+    marked = np.flatnonzero(mark)
+    state = mark[marked]
+    change = marked[1:][state[1:] != state[:-1]]
+    i = crossing[np.searchsorted(crossing, change) - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (level - y[i]) / (y[i + 1] - y[i])
+    return i + fraction, mark[change] > 0
+
+
+def _positions(y, level, hysteresis, x):
+    """Rising and falling crossings of 'level' in x-axis values"""
+    position, isrising = _crossings(y, level, hysteresis)
+    if x is not None:
+        i = position.astype(int)
+        upper = x[np.minimum(i + 1, x.size - 1)]
+        position = x[i] + (position - i) * (upper - x[i])
+    return position[isrising], position[~isrising]
+
+
+def find_crossings(y, level, hysteresis=0.0, x=None):
+    """Find all crossings of a level
+
+    Finds every rising and falling crossing of 'level' and interpolates the
+    position of each crossing linearly between the samples. With hysteresis, a
+    crossing counts only once the signal also passes level ± hysteresis / 2, so
+    noise around the level doesn't produce extra crossings.
+
+    Parameters
+    ----------
+    y : array-like
+        1D waveform
+    level : float
+    hysteresis : float
+        width of the band around level
+    x : array-like
+        x-axis such as time of the waveform, defaults to the sample index
+
+    Returns
+    -------
+    (rising, falling) : 2-tuple of ndarray
+        positions of the crossings on the x-axis
+    """
+    units = getattr(y, "units", None)
+    x_units = getattr(x, "units", 1)
+    y = np.asarray(y, dtype=np.float64)
+    level = _value(level, units)
+    hysteresis = _value(hysteresis, units)
+    if x is not None:
+        x = np.asarray(x, dtype=np.float64)
+    rising, falling = _positions(y, level, hysteresis, x)
+    return rising * x_units, falling * x_units
+
+
+def measure_edges(y, x=None, low=0.1, high=0.9, hysteresis=0.05, base=None, top=None):
+    """Measure the edges of a pulse waveform
+
+    The levels are fractions of the span from 'base' to 'top'. Period, frequency
+    and duty cycle refer to the mid level crossings. The rise time of an edge is
+    the time from the last low level crossing to the next high level crossing
+    around its mid level crossing and likewise for the fall time.
+
+    Parameters
+    ----------
+    y : array-like
+        1D waveform
+    x : array-like
+        x-axis such as time of the waveform, defaults to the sample index
+    low : float
+        low level as fraction of the span
+    high : float
+        high level as fraction of the span
+    hysteresis : float
+        width of the band around each level as fraction of the span
+    base : float
+        low state of the waveform, defaults to its minimum
+    top : float
+        high state of the waveform, defaults to its maximum
+
+    Returns
+    -------
+    EdgeMeasurements
+        namedtuple of ndarray, undefined values are NaN
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    units = getattr(y, "units", None)
+    x_units = getattr(x, "units", 1)
+    base = np.min(y) if base is None else base
+    top = np.max(y) if top is None else top
+    base, top = _value(base, units), _value(top, units)
+    y = np.asarray(y, dtype=np.float64)
+    if x is not None:
+        x = np.asarray(x, dtype=np.float64)
+    span = top - base
+    hysteresis = hysteresis * span
+    rising, falling = _positions(y, base + span / 2, hysteresis, x)
+    low_rising, low_falling = _positions(y, base + low * span, hysteresis, x)
+    high_rising, high_falling = _positions(y, base + high * span, hysteresis, x)
+
+    def _before(edges, at):
+        i = np.searchsorted(edges, at, side="right") - 1
+        edges = np.append(edges, np.nan)
+        return edges[np.where(i >= 0, i, -1)]
+
+    def _after(edges, at):
+        i = np.searchsorted(edges, at, side="left")
+        return np.append(edges, np.nan)[i]
+
+    period = np.diff(rising)
+    fall = _after(falling, rising[:-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        duty_cycle = (fall - rising[:-1]) / period
+        duty_cycle = np.where(duty_cycle <= 1, duty_cycle, np.nan)
+        frequency = 1 / period
+    rise_time = _after(high_rising, rising) - _before(low_rising, rising)
+    fall_time = _after(low_falling, falling) - _before(high_falling, falling)
+    return EdgeMeasurements(
+        rising * x_units,
+        falling * x_units,
+        period * x_units,
+        frequency / x_units,
+        duty_cycle,
+        rise_time * x_units,
+        fall_time * x_units,
+    )
@@ -0,0 +1,82 @@
+"""FFT windows
+
+Windows depend only on their length and parameters, so they are computed once and
+cached for all spectral functions. The cached windows are read-only.
+"""
+import functools
+from collections import namedtuple
+import numpy as np
+
+__all__ = ["get_window"]
+
+Window = namedtuple("Window", ["values", "coherent_gain", "enbw"])
+Window.__doc__ = """FFT window
+
+Attributes
+----------
+    values: read-only ndarray
+    coherent_gain: float mean of the window
+    enbw: float equivalent noise bandwidth in bins
+"""
+
+COSINE_COEFFICIENTS = {
+    "hann": [0.5, 0.5],
+    "blackmanharris": [0.35875, 0.48829, 0.14128, 0.01168],
+    "flattop": [0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368],
+}
+DEFAULT_PARAMS = {"gaussian": (0.2,)}
+
+
+def _gaussian(n_samples, sigma):
+    i = np.arange(n_samples)
+    m = (n_samples - 1) / 2
+    return np.exp(-((i - m) ** 2) / (2 * (sigma * n_samples) ** 2))
+
+
+def _cosine(n_samples, coefficients):
+    phase = 2 * np.pi * np.arange(n_samples) / max(n_samples - 1, 1)
+    window = np.zeros(n_samples)
+    for k, a in enumerate(coefficients):
+        window += (-1) ** k * a * np.cos(k * phase)
+    return window
+
+
+@functools.lru_cache(maxsize=16)
+def _window(n_samples, name, params):
+    if name == "gaussian":
+        values = _gaussian(n_samples, *params)
+    elif name in ["rectangular", "boxcar"]:
+        values = np.ones(n_samples)
+    elif name in COSINE_COEFFICIENTS and not params:
+        values = _cosine(n_samples, COSINE_COEFFICIENTS[name])
+    else:
+        raise ValueError(f"invalid window '{name}'")
+    values.flags.writeable = False
+    coherent_gain = values.mean()
+    enbw = n_samples * (values ** 2).sum() / values.sum() ** 2
+    return Window(values, coherent_gain, enbw)
+
+
+def get_window(window, n_samples):
+    """Get an FFT window of length 'n_samples'
+
+    Parameters
+    ----------
+    window : str or tuple
+        window name {'gaussian', 'rectangular', 'hann', 'blackmanharris',
+        'flattop'} or a tuple of the name and its parameters such as
+        ('gaussian', 0.3) where sigma is relative to 'n_samples'
+    n_samples : int
+
+    Returns
+    -------
+    Window
+        namedtuple of (values, coherent_gain, enbw)
+    """
+    if isinstance(window, str):
+        name, params = window, ()
+    else:
+        name, *params = window
+    name = name.lower()
+    params = tuple(params) or DEFAULT_PARAMS.get(name, ())
+    return _window(int(n_samples), name, params)